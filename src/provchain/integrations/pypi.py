@@ -19,6 +19,7 @@ class PyPIClient:
             base_url=self.BASE_URL,
             rate_limit=self.RATE_LIMIT,
             time_window=60.0,
+            http2=True,
         )
         self.cache = cache
 
@@ -0,0 +1,54 @@
+"""Filesystem utilities"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# Listings of directories modified this recently are not cached: a file
+# created within the same mtime tick would not change the mtime again
+RACY_WINDOW_NS = 2_000_000_000
+
+# Directories whose listings are kept, least recently used evicted first
+MAX_CACHED_LISTINGS = 256
+
+_listings: OrderedDict[str, tuple[int, frozenset[str]]] = OrderedDict()
+_listings_lock = threading.Lock()
+
+
+def directory_files(directory: str | Path) -> frozenset[str]:
+    """Get the names of the files in a directory, rescanning only when it has changed
+
+    Lets callers probe for several sibling files with one stat of the
+    directory instead of one stat per candidate. Subdirectories and
+    dangling symlinks are left out, as Path.is_file() would reject them.
+    Missing directories are reported as empty.
+    """
+    directory = os.fspath(directory) or "."
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        with _listings_lock:
+            _listings.pop(directory, None)
+        return frozenset()
+
+    with _listings_lock:
+        cached = _listings.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            _listings.move_to_end(directory)
+            return cached[1]
+
+    try:
+        with os.scandir(directory) as entries:
+            names = frozenset(entry.name for entry in entries if entry.is_file())
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+
+    if time.time_ns() - mtime_ns > RACY_WINDOW_NS:
+        with _listings_lock:
+            _listings[directory] = (mtime_ns, names)
+            _listings.move_to_end(directory)
+            while len(_listings) > MAX_CACHED_LISTINGS:
+                _listings.popitem(last=False)
+    return names
@@ -1,34 +1,92 @@
 """Hash calculation utilities"""
 
 import hashlib
+import mmap
+import os
+import sys
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any, Protocol
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+class _Hasher(Protocol):
+    """The part of the hashlib object interface used here (blake3 matches it too)"""
+
+    def update(self, data: Any, /) -> None: ...
+
+    def digest(self) -> bytes: ...
+
+    def hexdigest(self) -> str: ...
+
+
+def _digest_file(file_path: str | Path, digest: Callable[[], _Hasher]) -> _Hasher:
+    """Feed a file's contents to a new hashlib object and return it"""
+    with open(file_path, "rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            try:
+                # Let the kernel read ahead so disk reads overlap hashing
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+
+        if sys.version_info >= (3, 11):
+            # Hashes in C with the GIL released, no per-chunk Python overhead.
+            # typeshed wants a full hashlib object here, not just _Hasher
+            return hashlib.file_digest(f, digest)  # type: ignore[arg-type]
+
+        hasher = digest()
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+        except ValueError:
+            # Empty files cannot be mapped
+            hasher.update(f.read())
+        return hasher
+
+
+def _hash_file(file_path: str | Path, digest: Callable[[], _Hasher]) -> str:
+    """Hash a file's contents with the given hashlib constructor"""
+    return _digest_file(file_path, digest).hexdigest()
 
 
 def calculate_sha256(file_path: str | Path) -> str:
     """Calculate SHA256 hash of a file"""
-    sha256 = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+    return _hash_file(file_path, hashlib.sha256)
 
 
 def calculate_md5(file_path: str | Path) -> str:
     """Calculate MD5 hash of a file (non-cryptographic use only)"""
-    md5 = hashlib.md5(usedforsecurity=False)
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            md5.update(chunk)
-    return md5.hexdigest()
+    return _hash_file(file_path, lambda: hashlib.md5(usedforsecurity=False))
 
 
 def calculate_blake2b(file_path: str | Path) -> str:
     """Calculate BLAKE2b hash of a file"""
-    blake2b = hashlib.blake2b()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            blake2b.update(chunk)
-    return blake2b.hexdigest()
+    return _hash_file(file_path, hashlib.blake2b)
+
+
+def calculate_blake2b_256(file_path: str | Path) -> str:
+    """Calculate 256-bit BLAKE2b hash of a file (PyPI's blake2b_256 digest)"""
+    return _hash_file(file_path, lambda: hashlib.blake2b(digest_size=32))
+
+
+def calculate_blake3(file_path: str | Path) -> str:
+    """Calculate BLAKE3 hash of a file (requires the blake3 package)"""
+    if blake3 is None:
+        raise ValueError("Unsupported hash algorithm: blake3 (install the blake3 package)")
+    return _hash_file(file_path, blake3.blake3)
+
+
+def supported_algorithms() -> frozenset[str]:
+    """Algorithms accepted by calculate_hash in this environment"""
+    algorithms = {"sha256", "md5", "blake2b", "blake2b_256"}
+    if blake3 is not None:
+        algorithms.add("blake3")
+    return frozenset(algorithms)
 
 
 def calculate_hash(file_path: str | Path, algorithm: str = "sha256") -> str:
@@ -39,5 +97,21 @@ def calculate_hash(file_path: str | Path, algorithm: str = "sha256") -> str:
         return calculate_md5(file_path)
     elif algorithm.lower() == "blake2b":
         return calculate_blake2b(file_path)
+    elif algorithm.lower() == "blake2b_256":
+        return calculate_blake2b_256(file_path)
+    elif algorithm.lower() == "blake3":
+        return calculate_blake3(file_path)
     else:
         raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+
+
+def calculate_digest(file_path: str | Path, algorithm: str = "sha256") -> bytes:
+    """Calculate the raw digest of a file with any hashlib algorithm
+
+    For callers that need bytes (e.g. to base64-encode), avoiding a hex round-trip.
+    """
+    try:
+        hashlib.new(algorithm)
+    except ValueError:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}") from None
+    return _digest_file(file_path, lambda: hashlib.new(algorithm)).digest()
@@ -1,11 +1,17 @@
 """HTTP client wrapper with rate limiting"""
 
 import asyncio
+import threading
 import time
 from typing import Any
 
 import httpx
 
+try:
+    import h2
+except ImportError:
+    h2 = None
+
 
 class RateLimiter:
     """Simple rate limiter"""
@@ -13,10 +19,18 @@ class RateLimiter:
     def __init__(self, max_requests: int, time_window: float):
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = []
+        self.requests: list[float] = []
+        # Clients are shared across worker threads (e.g. HashVerifier.verify_many)
+        self._lock = threading.Lock()
 
     def wait_if_needed(self) -> None:
         """Wait if rate limit would be exceeded"""
+        # Held while sleeping too: waiters queue up rather than all waking at once
+        with self._lock:
+            self._wait_if_needed()
+
+    def _wait_if_needed(self) -> None:
+        """wait_if_needed, with the lock held"""
         now = time.time()
         # Remove old requests outside the time window
         self.requests = [
@@ -51,6 +65,7 @@ class HTTPClient:
         timeout: float = 30.0,
         max_retries: int = 3,
         max_response_size: int | None = None,
+        http2: bool = False,
     ):
         self.base_url = base_url
         self.rate_limiter = RateLimiter(rate_limit, time_window)
@@ -65,6 +80,8 @@ class HTTPClient:
             timeout=timeout,
             follow_redirects=True,
             verify=True,  # Explicitly enable SSL verification
+            # HTTP/2 needs the optional h2 package; otherwise use HTTP/1.1
+            http2=http2 and h2 is not None,
         )
 
     def get(self, url: str, **kwargs: Any) -> httpx.Response:
@@ -1,9 +1,21 @@
 """Verifier engine: Provenance verification orchestrator"""
 
+import base64
+import csv
+import importlib.util
+import os
+import site
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from importlib.machinery import ModuleSpec
 from pathlib import Path
 from typing import Any
 
+from packaging.utils import canonicalize_name
+
+from provchain.data.cache import Cache
 from provchain.data.models import PackageIdentifier
+from provchain.utils.hashing import calculate_digest
 from provchain.verifier.provenance.hash import HashVerifier
 from provchain.verifier.provenance.sigstore import SigstoreVerifier
 
@@ -11,9 +23,140 @@ from provchain.verifier.provenance.sigstore import SigstoreVerifier
 class VerifierEngine:
     """Main orchestrator for provenance verification"""
 
-    def __init__(self):
-        self.hash_verifier = HashVerifier()
-        self.sigstore_verifier = SigstoreVerifier()
+    def __init__(self, verify_record: bool = False, cache: Cache | None = None):
+        # Hash every file listed in an installed package's RECORD
+        self.verify_record = verify_record
+        # Persists PyPI metadata and verified artifact digests across runs
+        self.cache = cache
+        self._spec_cache: dict[str, ModuleSpec | None] = {}
+
+    @cached_property
+    def hash_verifier(self) -> HashVerifier:
+        """Hash verifier, created on first use"""
+        return HashVerifier(cache=self.cache)
+
+    @cached_property
+    def sigstore_verifier(self) -> SigstoreVerifier:
+        """Sigstore verifier, created on first use"""
+        return SigstoreVerifier()
+
+    @cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        """Worker pool shared by all parallel checks, created on first use"""
+        return ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2))
+
+    @cached_property
+    def _site_packages(self) -> tuple[str, ...]:
+        """Site-packages directories, looked up once per engine"""
+        return tuple(site.getsitepackages())
+
+    @cached_property
+    def _installed_index(self) -> dict[str, Path]:
+        """Map canonical project names to installed .dist-info/.egg-info directories
+
+        Built from a single scan of each site-packages directory. Earlier
+        directories take precedence, and .dist-info wins over .egg-info.
+        """
+        index: dict[str, Path] = {}
+        for site_dir in self._site_packages:
+            try:
+                with os.scandir(site_dir) as entries:
+                    for entry in entries:
+                        stem, _, suffix = entry.name.rpartition(".")
+                        if suffix not in ("dist-info", "egg-info"):
+                            continue
+                        name = canonicalize_name(stem.split("-", 1)[0])
+                        existing = index.get(name)
+                        if existing is None or (
+                            suffix == "dist-info"
+                            and existing.suffix == ".egg-info"
+                            and existing.parent == Path(site_dir)
+                        ):
+                            index[name] = Path(entry.path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return index
+
+    def _find_spec(self, package_name: str) -> ModuleSpec | None:
+        """Locate a package's import spec, memoised per engine"""
+        if package_name not in self._spec_cache:
+            self._spec_cache[package_name] = importlib.util.find_spec(package_name)
+        return self._spec_cache[package_name]
+
+    @staticmethod
+    def _record_digest(file_path: Path, algorithm: str) -> str:
+        """Hash a file and encode the digest the way RECORD files store it"""
+        digest = calculate_digest(file_path, algorithm)
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+    def _verify_record(self, dist_info: Path) -> dict[str, Any] | None:
+        """Check installed files against the hashes in a dist-info RECORD
+
+        Returns None when the distribution has no RECORD file.
+        """
+        record_file = dist_info / "RECORD"
+        try:
+            with open(record_file, newline="", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+        except FileNotFoundError:
+            return None
+
+        # RECORD paths are relative to the directory containing the dist-info
+        install_root = dist_info.parent
+        entries: list[tuple[str, str, str]] = []
+        for row in rows:
+            if len(row) < 2 or "=" not in row[1]:
+                # RECORD itself and generated files (e.g. .pyc) carry no hash
+                continue
+            algorithm, _, expected = row[1].partition("=")
+            entries.append((row[0], algorithm, expected))
+
+        def check(entry: tuple[str, str, str]) -> str:
+            path, algorithm, expected = entry
+            try:
+                actual = self._record_digest(install_root / path, algorithm)
+            except FileNotFoundError:
+                return "missing"
+            except OSError:
+                # Permission errors, directories, and the like
+                return "unreadable"
+            except (TypeError, ValueError):
+                # Unknown algorithms, or variable-length ones such as shake_*
+                return "unsupported"
+            return "ok" if actual == expected else "mismatch"
+
+        outcomes = list(self._executor.map(check, entries))
+
+        by_outcome: dict[str, list[str]] = {}
+        for (path, _, _), outcome in zip(entries, outcomes):
+            by_outcome.setdefault(outcome, []).append(path)
+        verified = by_outcome.get("ok", [])
+        mismatched = by_outcome.get("mismatch", [])
+        missing = by_outcome.get("missing", [])
+        unreadable = by_outcome.get("unreadable", [])
+        unsupported = by_outcome.get("unsupported", [])
+
+        # "verified" only when every hashed entry was actually checked
+        if mismatched or missing:
+            status = "mismatch"
+        elif not verified:
+            status = "limited"
+        elif unreadable or unsupported:
+            status = "incomplete"
+        else:
+            status = "verified"
+        result: dict[str, Any] = {
+            "status": status,
+            "source": "record",
+            "files": len(verified),
+            "mismatched": mismatched,
+            "missing": missing,
+            "unreadable": unreadable,
+            "unsupported": unsupported,
+        }
+        if status == "limited":
+            result["note"] = "No RECORD entry could be checked"
+        return result
 
     def verify_artifact(self, artifact_path: Path | str) -> dict[str, Any]:
         """Verify an artifact (wheel, sdist, or installed package)"""
@@ -41,10 +184,6 @@ class VerifierEngine:
 
     def verify_package(self, package_identifier: PackageIdentifier) -> dict[str, Any]:
         """Verify an installed package"""
-        import importlib.util
-        import site
-        from pathlib import Path
-
         package_name = package_identifier.name
 
         results: dict[str, Any] = {
@@ -54,56 +193,46 @@ class VerifierEngine:
 
         # Try to locate installed package
         try:
-            spec = importlib.util.find_spec(package_name)
-            if spec is None or spec.origin is None:
-                results["verifications"]["location"] = {
-                    "status": "not_found",
-                    "note": f"Package {package_name} is not installed",
-                }
-                return results
-
-            package_path = Path(spec.origin)
-
-            # Try to find the installed package's distribution metadata
             # Look in site-packages for .dist-info or .egg-info
-            site_packages = Path(site.getsitepackages()[0] if site.getsitepackages() else "")
-
-            dist_info = None
-            for dist_dir in site_packages.glob(f"{package_name.replace('-', '_')}-*.dist-info"):
-                dist_info = dist_dir
-                break
-
-            if not dist_info:
-                for dist_dir in site_packages.glob(f"{package_name.replace('-', '_')}-*.egg-info"):
-                    dist_info = dist_dir
-                    break
-
-            if dist_info:
-                # Try to verify the installed package
-                # For installed packages, we can check metadata
-                metadata_file = dist_info / "METADATA"
-                if metadata_file.exists():
-                    results["verifications"]["metadata"] = {
-                        "status": "found",
-                        "path": str(metadata_file),
-                    }
+            dist_info = self._installed_index.get(canonicalize_name(package_name))
 
-                    # Try hash verification if we can locate the wheel/sdist
-                    # This is limited for installed packages
-                    results["verifications"]["hash"] = {
-                        "status": "limited",
-                        "note": "Hash verification for installed packages requires original artifact",
-                    }
-                else:
-                    results["verifications"]["metadata"] = {
+            if dist_info is None:
+                # Not a site-packages distribution; fall back to the import system
+                spec = self._find_spec(package_name)
+                if spec is None or spec.origin is None:
+                    results["verifications"]["location"] = {
                         "status": "not_found",
+                        "note": f"Package {package_name} is not installed",
                     }
-            else:
+                    return results
+
                 results["verifications"]["location"] = {
                     "status": "found",
-                    "path": str(package_path),
+                    "path": os.fspath(spec.origin),
                     "note": "Package found but distribution metadata not located",
                 }
+                return results
+
+            # Try to verify the installed package
+            # For installed packages, we can check metadata
+            metadata_file = dist_info / "METADATA"
+            if metadata_file.exists():
+                results["verifications"]["metadata"] = {
+                    "status": "found",
+                    "path": str(metadata_file),
+                }
+
+                # Installed files can be checked against RECORD; verifying the
+                # original wheel/sdist requires the artifact itself
+                record_result = self._verify_record(dist_info) if self.verify_record else None
+                results["verifications"]["hash"] = record_result or {
+                    "status": "limited",
+                    "note": "Hash verification for installed packages requires original artifact",
+                }
+            else:
+                results["verifications"]["metadata"] = {
+                    "status": "not_found",
+                }
 
         except Exception as e:
             results["verifications"]["error"] = {
@@ -112,3 +241,18 @@ class VerifierEngine:
             }
 
         return results
+
+    def close(self) -> None:
+        """Shut down the worker pool and network clients if they were started"""
+        executor = self.__dict__.pop("_executor", None)
+        if executor is not None:
+            executor.shutdown()
+        hash_verifier = self.__dict__.pop("hash_verifier", None)
+        if hash_verifier is not None:
+            hash_verifier.close()
+
+    def __enter__(self) -> "VerifierEngine":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
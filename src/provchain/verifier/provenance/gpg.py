@@ -1,13 +1,74 @@
 """GPG signature verification"""
 
+import os
 import subprocess
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
+from provchain.utils.files import directory_files
+from provchain.utils.hashing import calculate_hash
+
+try:
+    import gnupg
+except ImportError:
+    gnupg = None
+
+# (status, signature_status) verdicts safe to reuse for identical content.
+# A BADSIG stays a failure whatever happens to the keyring. GOODSIG is not
+# cached: it turns into NO_PUBKEY, REVKEYSIG or EXPKEYSIG once the signer's
+# key is removed, revoked or expires. Other failures (ERRSIG, no verdict,
+# timeouts, errors) can clear up, so they are never cached either
+CACHEABLE_VERDICTS = frozenset({("verification_failed", "BADSIG")})
+
+# python-gnupg's status text for a BADSIG verdict
+GNUPG_BAD_SIGNATURE = "signature bad"
+
+# Upper bound on gpg diagnostic output kept in results (and the cache)
+MAX_ERROR_OUTPUT = 4096
+
+# Machine-readable gpg --status-fd keywords that carry the signature verdict
+STATUS_PREFIX = b"[GNUPG:] "
+SIGNATURE_STATUSES = frozenset(
+    {b"GOODSIG", b"BADSIG", b"EXPSIG", b"EXPKEYSIG", b"REVKEYSIG", b"ERRSIG"}
+)
+
+# Environment variables gpg needs to locate itself and its keyring
+GPG_ENV_VARS = ("PATH", "HOME", "GNUPGHOME", "APPDATA", "USERPROFILE", "SYSTEMROOT")
+
 
 class GPGVerifier:
     """GPG signature verification"""
 
+    VERSION_ARGS = ("gpg", "--version")
+    VERIFY_ARGS = ("gpg", "--batch", "--status-fd", "1", "--verify")
+
+    def __init__(self, cache_size: int = 1024):
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        self._gpg: Any = None
+        self._gpg_available = False
+        # Minimal environment: faster process startup, locale-independent output
+        self._env = {name: os.environ[name] for name in GPG_ENV_VARS if name in os.environ}
+        self._env["LC_ALL"] = "C"
+
+    def _cache_get(self, key: tuple[str, str]) -> dict[str, Any] | None:
+        """Get cached verification result, marking it most recently used"""
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key: tuple[str, str], result: dict[str, Any]) -> None:
+        """Cache verification result, evicting the least recently used entry"""
+        verdict = (result.get("status"), result.get("signature_status"))
+        if verdict not in CACHEABLE_VERDICTS or self.cache_size <= 0:
+            return
+        self._cache[key] = dict(result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
     def verify(
         self, artifact_path: Path | str, signature_path: Path | str | None = None
     ) -> dict[str, Any]:
@@ -16,71 +77,181 @@ class GPGVerifier:
 
         # Find signature file
         if signature_path is None:
+            # One directory listing answers every candidate lookup
+            siblings = directory_files(artifact_path.parent)
+
             # Try common signature file names
             for ext in [".asc", ".sig", ".gpg"]:
                 candidate = artifact_path.with_suffix(artifact_path.suffix + ext)
-                if candidate.exists():
+                if candidate.name in siblings:
                     signature_path = candidate
                     break
 
-        if signature_path is None:
-            # Try .asc file with same base name
-            asc_path = artifact_path.with_suffix(".asc")
-            if asc_path.exists():
-                signature_path = asc_path
+            if signature_path is None:
+                # Try .asc file with same base name
+                asc_path = artifact_path.with_suffix(".asc")
+                if asc_path.name in siblings:
+                    signature_path = asc_path
+        elif not Path(signature_path).exists():
+            signature_path = None
 
-        if signature_path is None or not Path(signature_path).exists():
+        if signature_path is None:
             return {
                 "available": False,
                 "status": "no_signature",
                 "note": "No GPG signature file found",
             }
 
-        # Check if GPG is available
+        # Hashing is only worth it once gpg is known to be usable
+        unavailable = self._check_gpg()
+        if unavailable is not None:
+            return unavailable
+
+        # Reuse previous result for identical artifact/signature content
         try:
-            result = subprocess.run(
-                ["gpg", "--version"],
-                capture_output=True,
-                timeout=5,
+            cache_key = (
+                calculate_hash(artifact_path, "sha256"),
+                calculate_hash(signature_path, "sha256"),
             )
-            if result.returncode != 0:
+        except OSError:
+            cache_key = None
+
+        if cache_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return {**cached, "signature_file": str(signature_path)}
+
+        if gnupg is not None:
+            verification = self._verify_with_gnupg(artifact_path, signature_path)
+        else:
+            verification = self._verify_with_subprocess(artifact_path, signature_path)
+
+        if cache_key is not None:
+            self._cache_put(cache_key, verification)
+        return verification
+
+    def _get_gpg(self) -> Any:
+        """Get the shared python-gnupg handle, creating it on first use"""
+        if self._gpg is None:
+            self._gpg = gnupg.GPG()
+        return self._gpg
+
+    def _check_gpg(self) -> dict[str, Any] | None:
+        """Get the result to report when gpg cannot be used, or None if it can
+
+        A working gpg binary is remembered for the life of the verifier;
+        failures are checked again on every call.
+        """
+        if gnupg is not None:
+            try:
+                self._get_gpg()
+            except (OSError, ValueError):
                 return {
                     "available": False,
-                    "status": "gpg_unavailable",
-                    "note": "GPG is not available or not working",
+                    "status": "gpg_not_installed",
+                    "note": "GPG is not installed",
                 }
+            return None
+
+        if self._gpg_available:
+            return None
+        try:
+            result = subprocess.run(
+                self.VERSION_ARGS,
+                env=self._env,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                timeout=5,
+            )
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return {
                 "available": False,
                 "status": "gpg_not_installed",
                 "note": "GPG is not installed",
             }
+        if result.returncode != 0:
+            return {
+                "available": False,
+                "status": "gpg_unavailable",
+                "note": "GPG is not available or not working",
+            }
+        self._gpg_available = True
+        return None
 
-        # Verify signature
+    def _verify_with_gnupg(self, artifact_path: Path, signature_path: Path | str) -> dict[str, Any]:
+        """Verify signature through python-gnupg"""
+        try:
+            verified = self._get_gpg().verify_file(str(signature_path), str(artifact_path))
+        except Exception as e:
+            return {
+                "available": True,
+                "status": "error",
+                "error": str(e),
+            }
+
+        if verified.valid:
+            return {
+                "available": True,
+                "status": "verified",
+                "signature_file": str(signature_path),
+                "signature_status": "GOODSIG",
+                "note": "GPG signature verified successfully",
+            }
+        return {
+            "available": True,
+            "status": "verification_failed",
+            "signature_file": str(signature_path),
+            "signature_status": "BADSIG" if verified.status == GNUPG_BAD_SIGNATURE else None,
+            "error": verified.status or (verified.stderr or "")[:MAX_ERROR_OUTPUT],
+            "note": "GPG signature verification failed",
+        }
+
+    @staticmethod
+    def _parse_signature_status(status_output: bytes | None) -> str | None:
+        """Get the first signature verdict keyword from gpg --status-fd output"""
+        for line in (status_output or b"").splitlines():
+            if not line.startswith(STATUS_PREFIX):
+                continue
+            keyword = line[len(STATUS_PREFIX) :].split(b" ", 1)[0]
+            if keyword in SIGNATURE_STATUSES:
+                return keyword.decode("ascii")
+        return None
+
+    def _verify_with_subprocess(
+        self, artifact_path: Path, signature_path: Path | str
+    ) -> dict[str, Any]:
+        """Verify signature by invoking the gpg binary"""
         try:
             result = subprocess.run(
-                ["gpg", "--verify", str(signature_path), str(artifact_path)],
+                (*self.VERIFY_ARGS, str(signature_path), str(artifact_path)),
+                env=self._env,
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
                 timeout=30,
             )
 
-            if result.returncode == 0:
-                return {
+            signature_status = self._parse_signature_status(result.stdout)
+            if result.returncode == 0 and signature_status == "GOODSIG":
+                verification = {
                     "available": True,
                     "status": "verified",
                     "signature_file": str(signature_path),
+                    "signature_status": signature_status,
                     "note": "GPG signature verified successfully",
                 }
             else:
                 # Parse output for more details
-                output = result.stderr.decode("utf-8", errors="ignore")
-                return {
+                output = result.stderr[:MAX_ERROR_OUTPUT].decode("utf-8", errors="ignore")
+                verification = {
                     "available": True,
                     "status": "verification_failed",
                     "signature_file": str(signature_path),
+                    "signature_status": signature_status,
                     "error": output,
                     "note": "GPG signature verification failed",
                 }
+
+            return verification
         except subprocess.TimeoutExpired:
             return {
                 "available": True,
@@ -1,55 +1,235 @@
 """Hash verification"""
 
+import hmac
+import os
+import stat
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
 from pathlib import Path
 from typing import Any
 
+from provchain.data.cache import Cache
 from provchain.integrations.pypi import PyPIClient
-from provchain.utils.hashing import calculate_hash
+from provchain.utils.hashing import calculate_hash, supported_algorithms
+
+ARTIFACT_SUFFIXES = (".whl", ".tar.gz", ".tar.bz2", ".tgz", ".zip")
+
+# PyPI never accepts a re-upload under an existing filename, so a verified
+# (filename, digest) pair stays valid; the TTL only bounds cache growth
+VERIFIED_TTL = timedelta(days=30)
+
+# Digest algorithms in order of preference. SHA-256 is always published by
+# PyPI and hardware-accelerated on most CPUs, so it beats BLAKE2b; BLAKE3
+# (from indexes that publish it, with the blake3 extra) beats both
+ALGORITHM_ORDER = ("blake3", "sha256", "blake2b_256")
 
 
 class HashVerifier:
     """Verifies artifact hashes against PyPI's recorded digests"""
 
+    def __init__(self, cache: Cache | None = None):
+        self.cache = cache
+        self._release_digests: dict[tuple[str, str], dict[str, dict[str, str]]] = {}
+        self._pypi: PyPIClient | None = None
+        self._pypi_lock = threading.Lock()
+
+    def _get_pypi(self) -> PyPIClient:
+        """Get the shared PyPI client, creating it on first use
+
+        Reusing one client keeps its connection pool (and TLS sessions) alive
+        across every release fetched by this verifier.
+        """
+        with self._pypi_lock:
+            if self._pypi is None:
+                self._pypi = PyPIClient(cache=self.cache)
+            return self._pypi
+
+    def _get_release_digests(self, package_name: str, version: str) -> dict[str, dict[str, str]]:
+        """Map a release's filenames to their digests, fetched once per release"""
+        key = (package_name, version)
+        digests = self._release_digests.get(key)
+        if digests is None:
+            metadata = self._get_pypi().get_package_metadata(package_name, version)
+            digests = self._index_releases(metadata)
+            self._release_digests[key] = digests
+        return digests
+
+    @staticmethod
+    def _index_releases(metadata: dict[str, Any]) -> dict[str, dict[str, str]]:
+        """Flatten PyPI JSON metadata into a filename -> {algorithm: digest} map
+
+        Version endpoints list their files under "urls"; project endpoints
+        under "releases". Filenames are unique across a project, so every
+        file can share one index.
+        """
+        files = [*metadata.get("urls", ())]
+        for release_files in metadata.get("releases", {}).values():
+            files.extend(release_files)
+
+        index: dict[str, dict[str, str]] = {}
+        for file_info in files:
+            digests = {algo: value for algo, value in file_info.get("digests", {}).items() if value}
+            if digests:
+                index.setdefault(file_info.get("filename"), digests)
+        return index
+
+    @staticmethod
+    def _select_algorithm(digests: dict[str, str]) -> str | None:
+        """Pick the preferred algorithm that is both published and supported"""
+        supported = supported_algorithms()
+        for algorithm in ALGORITHM_ORDER:
+            if algorithm in digests and algorithm in supported:
+                return algorithm
+        return None
+
+    @staticmethod
+    def _parse_filename(filename: str) -> tuple[str, str] | None:
+        """Extract (package, version) from an artifact filename"""
+        for suffix in ARTIFACT_SUFFIXES:
+            if filename.endswith(suffix):
+                stem = filename[: -len(suffix)]
+                break
+        else:
+            stem = filename
+
+        # Wheels: name-version[-build]-python-abi-platform, where the name
+        # itself cannot contain "-"
+        if filename.endswith(".whl") and stem.count("-") in (4, 5):
+            package_name, _, rest = stem.partition("-")
+            version = rest.partition("-")[0]
+        else:
+            # sdists and bare name-version artifacts
+            package_name, _, version = stem.rpartition("-")
+
+        if not package_name or not version:
+            return None
+        return package_name, version
+
+    def verify_many(
+        self, artifact_paths: Iterable[Path | str], max_workers: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Verify several artifacts, overlapping PyPI fetches with hashing
+
+        Metadata for each release is fetched once and files are hashed in
+        parallel. Results are returned in input order.
+        """
+        paths = [Path(path) for path in artifact_paths]
+        releases = {parsed for path in paths if (parsed := self._parse_filename(path.name))}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Fetches are queued first, so by the time a verification starts
+            # every fetch it could wait on is already running
+            fetches = {
+                release: executor.submit(self._get_release_digests, *release)
+                for release in releases
+            }
+
+            def verify_one(path: Path) -> dict[str, Any]:
+                parsed = self._parse_filename(path.name)
+                fetch = fetches.get(parsed) if parsed is not None else None
+                if fetch is not None:
+                    # A failed fetch is retried by verify, which reports the error
+                    wait([fetch])
+                return self.verify(path)
+
+            return list(executor.map(verify_one, paths))
+
+    @staticmethod
+    def _digests_match(calculated: str, expected: str) -> bool:
+        """Compare hex digests case-insensitively in constant time"""
+        # Bytes so non-ASCII metadata cannot raise
+        return hmac.compare_digest(calculated.lower().encode(), expected.lower().encode())
+
     def verify(self, artifact_path: Path | str) -> dict[str, Any]:
-        """Verify artifact hash against PyPI"""
+        """Verify artifact hash against PyPI
+
+        The fastest algorithm PyPI publishes a digest for is used (see
+        ALGORITHM_ORDER).
+        """
         artifact_path = Path(artifact_path)
 
         # Extract package name and version from artifact filename
-        # This is simplified - production would need proper parsing
         filename = artifact_path.name
-        # Assume format: package-version.whl or package-version.tar.gz
-        parts = filename.replace(".whl", "").replace(".tar.gz", "").split("-")
-        if len(parts) >= 2:
-            package_name = "-".join(parts[:-1])
-            version = parts[-1]
-        else:
+        parsed = self._parse_filename(filename)
+        if parsed is None:
             return {"error": "Could not parse package name and version from filename"}
+        package_name, version = parsed
 
-        # Calculate hash
+        # One stat up front: missing files fail before any PyPI request, and
+        # FIFOs or devices are never opened for hashing
         try:
-            calculated_hash = calculate_hash(artifact_path, "sha256")
-        except Exception as e:
+            mode = os.stat(artifact_path).st_mode
+        except OSError as e:
             return {"error": f"Failed to calculate hash: {e}"}
+        if not stat.S_ISREG(mode):
+            return {"error": f"Failed to calculate hash: {filename} is not a regular file"}
+
+        # Artifacts verified before (e.g. on a previous CI run) skip PyPI
+        calculated_hash: str | None = None
+        hashed_with: str | None = None
+        remembered = self.cache.get("hash", "verified", filename) if self.cache else None
+        if remembered:
+            hashed_with = remembered["algorithm"]
+            try:
+                calculated_hash = calculate_hash(artifact_path, hashed_with)
+            except Exception as e:
+                return {"error": f"Failed to calculate hash: {e}"}
+            if self._digests_match(calculated_hash, remembered["digest"]):
+                return {
+                    "algorithm": hashed_with,
+                    "calculated": calculated_hash,
+                    "expected": remembered["digest"],
+                    "matches": True,
+                    "status": "verified",
+                    "cached": True,
+                }
 
-        # Fetch expected hash from PyPI
+        # Fetch expected digests from PyPI
         try:
-            with PyPIClient() as pypi:
-                metadata = pypi.get_package_metadata(package_name, version)
-                # PyPI JSON API includes file hashes in releases
-                releases = metadata.get("releases", {}).get(version, [])
-                for file_info in releases:
-                    if file_info.get("filename") == filename:
-                        expected_hash = file_info.get("digests", {}).get("sha256")
-                        if expected_hash:
-                            matches = calculated_hash.lower() == expected_hash.lower()
-                            return {
-                                "algorithm": "sha256",
-                                "calculated": calculated_hash,
-                                "expected": expected_hash,
-                                "matches": matches,
-                                "status": "verified" if matches else "mismatch",
-                            }
+            digests = self._get_release_digests(package_name, version).get(filename, {})
         except Exception as e:
             return {"error": f"Failed to fetch expected hash: {e}"}
 
-        return {"error": "Hash information not found on PyPI"}
+        algorithm = hashed_with or self._select_algorithm(digests)
+        expected_hash = digests.get(algorithm) if algorithm else None
+        if algorithm is None or not expected_hash:
+            return {"error": "Hash information not found on PyPI"}
+
+        # Calculate hash
+        if calculated_hash is None:
+            try:
+                calculated_hash = calculate_hash(artifact_path, algorithm)
+            except Exception as e:
+                return {"error": f"Failed to calculate hash: {e}"}
+
+        matches = self._digests_match(calculated_hash, expected_hash)
+        if matches and self.cache:
+            self.cache.set(
+                "hash",
+                {"algorithm": algorithm, "digest": expected_hash.lower()},
+                VERIFIED_TTL,
+                "verified",
+                filename,
+            )
+        return {
+            "algorithm": algorithm,
+            "calculated": calculated_hash,
+            "expected": expected_hash,
+            "matches": matches,
+            "status": "verified" if matches else "mismatch",
+        }
+
+    def close(self) -> None:
+        """Close the PyPI client if one was created"""
+        with self._pypi_lock:
+            if self._pypi is not None:
+                self._pypi.close()
+                self._pypi = None
+
+    def __enter__(self) -> "HashVerifier":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
@@ -1,8 +1,40 @@
 """Sigstore verification"""
 
+import importlib
 from pathlib import Path
 from typing import Any
 
+from provchain.utils.files import directory_files
+
+# sigstore.verify, imported on first use: None when sigstore-python is not
+# installed, _NOT_LOADED until the import has been attempted
+_NOT_LOADED: Any = object()
+_SIGSTORE_MOD: Any = _NOT_LOADED
+
+# Sibling files that may hold Sigstore signing material for an artifact
+_SIG_SUFFIXES = frozenset({".sig", ".crt", ".pem", ".bundle", ".sigstore"})
+
+
+def _load_sigstore() -> Any:
+    """Import sigstore.verify once per process, returning None if unavailable"""
+    global _SIGSTORE_MOD
+    if _SIGSTORE_MOD is _NOT_LOADED:
+        try:
+            _SIGSTORE_MOD = importlib.import_module("sigstore.verify")
+        except ImportError:
+            _SIGSTORE_MOD = None
+    return _SIGSTORE_MOD
+
+
+def _find_sig_files(artifact_path: Path) -> dict[str, Path]:
+    """Map suffixes in _SIG_SUFFIXES to the artifact's matching sibling files"""
+    siblings = directory_files(artifact_path.parent)
+    return {
+        suffix: artifact_path.with_name(name)
+        for suffix in _SIG_SUFFIXES
+        if (name := artifact_path.name + suffix) in siblings
+    }
+
 
 class SigstoreVerifier:
     """Verifies Sigstore signatures for packages that support them"""
@@ -12,9 +44,10 @@ class SigstoreVerifier:
         artifact_path = Path(artifact_path)
 
         # Check for signature file
-        sig_path = artifact_path.with_suffix(artifact_path.suffix + ".sig")
+        sig_files = _find_sig_files(artifact_path)
+        sig_path = sig_files.get(".sig")
 
-        if not sig_path.exists():
+        if sig_path is None:
             return {
                 "available": False,
                 "status": "no_signature",
@@ -23,27 +56,26 @@ class SigstoreVerifier:
 
         try:
             # Try to use sigstore-python if available
-            try:
-                # Check if sigstore is available (for future implementation)
-                import importlib.util
-
-                if importlib.util.find_spec("sigstore.verify") is not None:
-                    # Sigstore is available - signature file exists, verification can be implemented
-                    # For now, just check signature format
-                    return {
-                        "available": True,
-                        "status": "signature_found",
-                        "note": "Sigstore signature file found (verification requires identity policy)",
-                        "signature_file": str(sig_path),
-                    }
-            except ImportError:
-                # sigstore-python not available, check if signature file exists
+            if _load_sigstore() is None:
                 return {
                     "available": False,
                     "status": "library_missing",
                     "note": "sigstore-python library required for verification",
-                    "signature_file": str(sig_path) if sig_path.exists() else None,
+                    "signature_file": str(sig_path),
                 }
+
+            # Sigstore is available - signature file exists, verification can be implemented
+            # For now, just check signature format
+            result = {
+                "available": True,
+                "status": "signature_found",
+                "note": "Sigstore signature file found (verification requires identity policy)",
+                "signature_file": str(sig_path),
+            }
+            cert_path = sig_files.get(".crt") or sig_files.get(".pem")
+            if cert_path is not None:
+                result["certificate_file"] = str(cert_path)
+            return result
         except Exception as e:
             return {
                 "available": False,
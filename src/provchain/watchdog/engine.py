@@ -1,6 +1,7 @@
 """Watchdog engine: Monitoring orchestrator"""
 
 import asyncio
+import logging
 from datetime import timedelta
 from typing import Any
 
@@ -11,6 +12,8 @@ from provchain.watchdog.monitors.maintainer import MaintainerMonitor
 from provchain.watchdog.monitors.release import ReleaseMonitor
 from provchain.watchdog.monitors.repo import RepositoryMonitor
 
+logger = logging.getLogger(__name__)
+
 
 class WatchdogEngine:
     """Main orchestrator for continuous monitoring"""
@@ -67,13 +70,13 @@ class WatchdogEngine:
                     # Trigger alert notifications
                     for alert in alerts:
                         # In production, this would send to configured channels
-                        print(f"Alert: {alert.title} - {alert.description}")
+                        logger.warning("Alert: %s - %s", alert.title, alert.description)
 
                 # Wait for next check interval
                 await asyncio.sleep(self.check_interval.total_seconds())
             except Exception as e:
                 # Log error and continue
-                print(f"Watchdog error: {e}")
+                logger.error("Watchdog error: %s", e)
                 await asyncio.sleep(60)  # Wait 1 minute before retrying
 
     def stop(self) -> None:
@@ -9,9 +9,8 @@ from provchain.data.cache import Cache
 from provchain.data.db import Database
 
 
-@pytest.fixture
-def temp_db():
-    """Create temporary database for testing"""
+def _temporary_database():
+    """Yield a Database backed by a temporary file, deleting it afterwards"""
     with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
         db_path = Path(f.name)
     db = Database(db_path=db_path)
@@ -32,6 +31,19 @@ def temp_db():
             pass
 
 
+@pytest.fixture
+def temp_db():
+    """Create temporary database for testing"""
+    yield from _temporary_database()
+
+
+@pytest.fixture(scope="module")
+def temp_db_module():
+    """Temporary database shared by a module's tests, for tests that don't
+    depend on what other tests have stored"""
+    yield from _temporary_database()
+
+
 @pytest.fixture
 def cache(temp_db):
     """Create cache for testing"""
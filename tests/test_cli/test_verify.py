@@ -14,6 +14,14 @@ def runner():
     return CliRunner()
 
 
+@pytest.fixture(autouse=True)
+def cache_class():
+    """Keep the command off the real database; return the patched Cache class"""
+    with patch('provchain.cli.commands.verify.Database'), \
+         patch('provchain.cli.commands.verify.Cache') as mock_cache_class:
+        yield mock_cache_class
+
+
 def test_verify_help(runner):
     """Test verify command help"""
     result = runner.invoke(app, ["--help"])
@@ -21,7 +29,7 @@ def test_verify_help(runner):
     assert "Verify" in result.stdout or "provenance" in result.stdout.lower()
 
 
-def test_verify_local_artifact(runner, tmp_path):
+def test_verify_local_artifact(runner, tmp_path, cache_class):
     """Test verifying a local artifact file"""
     artifact_file = tmp_path / "test-package-1.0.0.whl"
     artifact_file.write_text("fake wheel content")
@@ -34,7 +42,7 @@ def test_verify_local_artifact(runner, tmp_path):
                 "hash": {"status": "verified"}
             }
         }
-        mock_engine_class.return_value = mock_engine
+        mock_engine_class.return_value.__enter__.return_value = mock_engine
         
         # Invoke the command directly (the app has a single "verify" command)
         # File exists, so it should call verify_artifact
@@ -43,6 +51,8 @@ def test_verify_local_artifact(runner, tmp_path):
         # Should succeed (typer may exit with 0 even if there are issues)
         # The key is that verify_artifact was called
         mock_engine.verify_artifact.assert_called_once()
+        mock_engine_class.assert_called_once_with(cache=cache_class.return_value)
+        mock_engine_class.return_value.__exit__.assert_called_once()
         # Exit code should be 0 for success
         assert result.exit_code == 0 or "Verification result" in result.stdout
 
@@ -58,7 +68,7 @@ def test_verify_package_spec(runner):
                 "metadata": {"status": "found"}
             }
         }
-        mock_engine_class.return_value = mock_engine
+        mock_engine_class.return_value.__enter__.return_value = mock_engine
         
         # Mock Path to return a non-existent path
         mock_path = Mock()
@@ -80,7 +90,7 @@ def test_verify_invalid_path(runner):
          patch('provchain.cli.commands.verify.Path') as mock_path_class, \
          patch('provchain.cli.commands.verify.parse_package_spec') as mock_parse:
         mock_engine = Mock()
-        mock_engine_class.return_value = mock_engine
+        mock_engine_class.return_value.__enter__.return_value = mock_engine
         
         # Mock Path to return a non-existent path
         mock_path = Mock()
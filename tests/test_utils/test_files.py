@@ -0,0 +1,84 @@
+"""Tests for filesystem utilities"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from provchain.utils import files
+from provchain.utils.files import directory_files
+
+
+@pytest.fixture
+def settled_dir(tmp_path):
+    """Directory whose mtime is old enough for its listing to be cached"""
+    (tmp_path / "a.whl").write_bytes(b"")
+    old = time.time_ns() - 10 * files.RACY_WINDOW_NS
+    os.utime(tmp_path, ns=(old, old))
+    return tmp_path
+
+
+class TestDirectoryFiles:
+    """Test cases for directory_files"""
+
+    def test_lists_names(self, tmp_path):
+        """Test directory names are returned"""
+        (tmp_path / "a.whl").write_bytes(b"")
+        (tmp_path / "a.whl.sig").write_bytes(b"")
+
+        assert directory_files(tmp_path) == {"a.whl", "a.whl.sig"}
+
+    def test_missing_directory(self, tmp_path):
+        """Test a missing directory is reported as empty"""
+        assert directory_files(tmp_path / "missing") == frozenset()
+
+    def test_unchanged_directory_not_rescanned(self, settled_dir):
+        """Test a listing is reused while the directory mtime is unchanged"""
+        directory_files(settled_dir)
+
+        with patch('provchain.utils.files.os.scandir') as mock_scandir:
+            assert directory_files(settled_dir) == {"a.whl"}
+
+        mock_scandir.assert_not_called()
+
+    def test_changed_directory_rescanned(self, settled_dir):
+        """Test new files are seen once the directory changes"""
+        directory_files(settled_dir)
+        (settled_dir / "a.whl.sig").write_bytes(b"")
+
+        assert "a.whl.sig" in directory_files(settled_dir)
+
+    def test_recently_modified_directory_not_cached(self, tmp_path):
+        """Test listings are not cached while the mtime could still be reused"""
+        directory_files(tmp_path)
+
+        assert os.fspath(tmp_path) not in files._listings
+
+    def test_skips_directories_and_dangling_symlinks(self, tmp_path):
+        """Test only names that are files (or links to files) are returned"""
+        (tmp_path / "a.whl").write_bytes(b"")
+        (tmp_path / "a.whl.sig").mkdir()
+        (tmp_path / "a.whl.asc").symlink_to(tmp_path / "missing")
+        (tmp_path / "a.whl.pem").symlink_to(tmp_path / "a.whl")
+
+        assert directory_files(tmp_path) == {"a.whl", "a.whl.pem"}
+
+    def test_cached_listings_bounded(self, tmp_path, monkeypatch):
+        """Test the least recently used listing is evicted past the limit"""
+        monkeypatch.setattr(files, "MAX_CACHED_LISTINGS", 2)
+        monkeypatch.setattr(files, "_listings", type(files._listings)())
+        old = time.time_ns() - 10 * files.RACY_WINDOW_NS
+        dirs = []
+        for name in ("a", "b", "c"):
+            directory = tmp_path / name
+            directory.mkdir()
+            os.utime(directory, ns=(old, old))
+            dirs.append(directory)
+
+        directory_files(dirs[0])
+        directory_files(dirs[1])
+        directory_files(dirs[0])
+        directory_files(dirs[2])
+
+        assert list(files._listings) == [os.fspath(dirs[0]), os.fspath(dirs[2])]
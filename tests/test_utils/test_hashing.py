@@ -1,6 +1,7 @@
 """Tests for hashing utilities"""
 
 import hashlib
+import os
 import pytest
 from pathlib import Path
 from unittest.mock import patch, mock_open
@@ -10,6 +11,8 @@ from provchain.utils.hashing import (
     calculate_md5,
     calculate_blake2b,
     calculate_hash,
+    calculate_digest,
+    supported_algorithms,
 )
 
 
@@ -147,3 +150,67 @@ class TestHashing:
         with pytest.raises(FileNotFoundError):
             calculate_sha256(Path("/nonexistent/file.txt"))
 
+
+    @pytest.mark.parametrize("size", [0, 64 * 1024 - 1, 3 * 1024 * 1024 + 17])
+    @pytest.mark.parametrize("version_info", [(3, 10, 0), (3, 11, 0)])
+    def test_calculate_hash_backends_match(self, tmp_path, size, version_info):
+        """Test the mmap (pre-3.11) and file_digest paths agree with hashlib"""
+        if version_info >= (3, 11) and not hasattr(hashlib, "file_digest"):
+            pytest.skip("hashlib.file_digest requires Python 3.11")
+        test_file = tmp_path / "artifact.bin"
+        content = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+        test_file.write_bytes(content)
+        
+        with patch('provchain.utils.hashing.sys') as mock_sys:
+            mock_sys.version_info = version_info
+            
+            assert calculate_sha256(test_file) == hashlib.sha256(content).hexdigest()
+            assert calculate_md5(test_file) == hashlib.md5(content).hexdigest()
+            assert calculate_blake2b(test_file) == hashlib.blake2b(content).hexdigest()
+
+    def test_calculate_hash_requests_sequential_readahead(self, tmp_path):
+        """Test hashing advises sequential access and tolerates advice failures"""
+        if not hasattr(os, "posix_fadvise"):
+            pytest.skip("posix_fadvise not available on this platform")
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        
+        with patch('provchain.utils.hashing.os.posix_fadvise') as mock_fadvise:
+            mock_fadvise.side_effect = OSError("not supported")
+            
+            result = calculate_sha256(test_file)
+            
+            assert mock_fadvise.call_args[0][3] == os.POSIX_FADV_SEQUENTIAL
+        assert result == hashlib.sha256(b"test content").hexdigest()
+
+    @pytest.mark.parametrize("algorithm", ["sha256", "sha384", "blake2b"])
+    def test_calculate_digest(self, tmp_path, algorithm):
+        """Test raw digests match hashlib for any supported algorithm"""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        
+        assert calculate_digest(test_file, algorithm) == hashlib.new(algorithm, b"test content").digest()
+
+    def test_calculate_digest_unsupported_algorithm(self, tmp_path):
+        """Test unsupported algorithms are rejected before the file is read"""
+        with pytest.raises(ValueError, match="Unsupported hash algorithm"):
+            calculate_digest(tmp_path / "missing.txt", "unsupported")
+
+    def test_calculate_hash_blake2b_256(self, tmp_path):
+        """Test 256-bit BLAKE2b matches PyPI's blake2b_256 digest format"""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        
+        result = calculate_hash(test_file, "blake2b_256")
+        
+        assert result == hashlib.blake2b(b"test content", digest_size=32).hexdigest()
+
+    def test_calculate_hash_blake3_requires_package(self, tmp_path):
+        """Test BLAKE3 is only offered when the blake3 package is installed"""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        
+        with patch('provchain.utils.hashing.blake3', None):
+            assert "blake3" not in supported_algorithms()
+            with pytest.raises(ValueError, match="blake3"):
+                calculate_hash(test_file, "blake3")
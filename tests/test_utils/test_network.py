@@ -1,6 +1,7 @@
 """Tests for network utilities"""
 
 import pytest
+import threading
 import time
 from unittest.mock import Mock, patch, MagicMock, AsyncMock
 import httpx
@@ -29,6 +30,21 @@ class TestRateLimiter:
         
         assert len(limiter.requests) == 5
 
+    def test_rate_limiter_serializes_threads(self):
+        """Test concurrent callers take turns instead of racing on the request list"""
+        limiter = RateLimiter(max_requests=10, time_window=60.0)
+        
+        with limiter._lock:
+            worker = threading.Thread(target=limiter.wait_if_needed)
+            worker.start()
+            worker.join(timeout=0.05)
+            # Blocked while another caller holds the limiter
+            assert worker.is_alive()
+            assert limiter.requests == []
+        
+        worker.join(timeout=2.0)
+        assert len(limiter.requests) == 1
+
     @patch('provchain.utils.network.time.sleep')
     @patch('provchain.utils.network.time.time')
     def test_rate_limiter_wait_if_needed_waits(self, mock_time, mock_sleep):
@@ -92,6 +108,16 @@ class TestHTTPClient:
         assert client.timeout == 60.0
         assert client.max_retries == 5
 
+    @pytest.mark.parametrize("h2_installed", [True, False])
+    def test_http_client_http2_requires_h2(self, h2_installed):
+        """Test HTTP/2 is only enabled when the h2 package is available"""
+        h2 = Mock() if h2_installed else None
+        with patch('provchain.utils.network.h2', h2), \
+             patch('provchain.utils.network.httpx.Client') as mock_client:
+            HTTPClient(http2=True)
+            
+            assert mock_client.call_args.kwargs["http2"] is h2_installed
+
     def test_http_client_get_success(self):
         """Test successful GET request"""
         with patch('provchain.utils.network.httpx.Client') as mock_client_class:
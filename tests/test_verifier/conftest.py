@@ -0,0 +1,50 @@
+"""Shared fixtures for verifier tests"""
+
+from dataclasses import dataclass
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@dataclass
+class Clients:
+    """Pre-wired PyPIClient/HTTPClient doubles shared by builder tests"""
+
+    pypi: MagicMock
+    http: MagicMock
+    response: MagicMock
+
+    def reset(self):
+        """Clear recorded calls and overrides, then restore the default wiring"""
+        for mock in (self.pypi, self.http, self.response):
+            mock.reset_mock(return_value=True, side_effect=True)
+        self.pypi.__enter__.return_value = self.pypi
+        self.pypi.__exit__.return_value = None
+        self.http.__enter__.return_value = self.http
+        self.http.__exit__.return_value = None
+        self.http.get.return_value = self.response
+        self.response.content = b"sdist content"
+
+
+@pytest.fixture
+def dummy_artifact(tmp_path):
+    """Create a placeholder wheel artifact"""
+    artifact = tmp_path / "package.whl"
+    artifact.write_bytes(b"fake package")
+    return artifact
+
+
+@pytest.fixture
+def dummy_signature(dummy_artifact):
+    """Create a detached signature next to the placeholder artifact"""
+    signature = dummy_artifact.with_name(dummy_artifact.name + ".asc")
+    signature.write_bytes(b"fake signature")
+    return signature
+
+
+@pytest.fixture(scope="module")
+def client_mocks():
+    """Client doubles built once per module; reset them before each use"""
+    clients = Clients(pypi=MagicMock(), http=MagicMock(), response=MagicMock())
+    clients.reset()
+    return clients
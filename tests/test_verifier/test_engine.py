@@ -4,6 +4,7 @@ import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+from provchain.data.cache import Cache
 from provchain.data.models import PackageIdentifier
 from provchain.verifier.engine import VerifierEngine
 
@@ -16,11 +17,39 @@ def test_verifier_engine_init():
     assert engine.sigstore_verifier is not None
 
 
-def test_verifier_engine_verify_artifact(tmp_path):
-    """Test verifying a local artifact"""
-    artifact_file = tmp_path / "test-package-1.0.0.whl"
-    artifact_file.write_text("fake wheel content")
+def test_verifier_engine_passes_cache_to_hash_verifier():
+    """Test the engine's cache backs the hash verifier"""
+    cache = Mock(spec=Cache)
+    
+    assert VerifierEngine(cache=cache).hash_verifier.cache is cache
+    assert VerifierEngine().hash_verifier.cache is None
+
+
+def test_verifier_engine_executor_lifecycle():
+    """Test the shared executor is created lazily, reused, and shut down on exit"""
+    with VerifierEngine() as engine:
+        assert "_executor" not in vars(engine)
+        executor = engine._executor
+        assert engine._executor is executor
     
+    assert "_executor" not in vars(engine)
+    assert executor._shutdown
+    engine.close()
+
+
+def test_verifier_engine_close_closes_hash_verifier():
+    """Test closing the engine releases the hash verifier's PyPI client"""
+    engine = VerifierEngine()
+    
+    with patch.object(engine.hash_verifier, 'close') as mock_close:
+        engine.close()
+    
+    mock_close.assert_called_once()
+    assert "hash_verifier" not in vars(engine)
+
+
+def test_verifier_engine_verify_artifact(dummy_artifact):
+    """Test verifying a local artifact"""
     engine = VerifierEngine()
     
     with patch.object(engine.hash_verifier, 'verify') as mock_hash, \
@@ -29,19 +58,16 @@ def test_verifier_engine_verify_artifact(tmp_path):
         mock_hash.return_value = {"status": "verified", "matches": True}
         mock_sigstore.return_value = {"status": "verified", "available": True}
         
-        result = engine.verify_artifact(artifact_file)
+        result = engine.verify_artifact(dummy_artifact)
         
-        assert result["artifact"] == str(artifact_file)
+        assert result["artifact"] == str(dummy_artifact)
         assert "verifications" in result
         assert "hash" in result["verifications"]
         mock_hash.assert_called_once()
 
 
-def test_verifier_engine_verify_artifact_hash_error(tmp_path):
+def test_verifier_engine_verify_artifact_hash_error(dummy_artifact):
     """Test verifying artifact when hash verification fails"""
-    artifact_file = tmp_path / "test-package-1.0.0.whl"
-    artifact_file.write_text("fake wheel content")
-    
     engine = VerifierEngine()
     
     with patch.object(engine.hash_verifier, 'verify') as mock_hash, \
@@ -50,17 +76,14 @@ def test_verifier_engine_verify_artifact_hash_error(tmp_path):
         mock_hash.side_effect = Exception("Hash error")
         mock_sigstore.return_value = {"status": "verified"}
         
-        result = engine.verify_artifact(artifact_file)
+        result = engine.verify_artifact(dummy_artifact)
         
         assert "verifications" in result
         assert "hash" in result["verifications"]
         assert "error" in result["verifications"]["hash"]
 
-def test_verifier_engine_verify_artifact_sigstore_error(tmp_path):
+def test_verifier_engine_verify_artifact_sigstore_error(dummy_artifact):
     """Test verifying artifact when sigstore verification fails"""
-    artifact_file = tmp_path / "test-package-1.0.0.whl"
-    artifact_file.write_text("fake wheel content")
-    
     engine = VerifierEngine()
     
     with patch.object(engine.hash_verifier, 'verify') as mock_hash, \
@@ -69,7 +92,7 @@ def test_verifier_engine_verify_artifact_sigstore_error(tmp_path):
         mock_hash.return_value = {"status": "verified", "matches": True}
         mock_sigstore.side_effect = Exception("Sigstore error")
         
-        result = engine.verify_artifact(artifact_file)
+        result = engine.verify_artifact(dummy_artifact)
         
         assert "verifications" in result
         assert "sigstore" in result["verifications"]
@@ -83,7 +106,8 @@ def test_verifier_engine_verify_package():
     
     pkg_id = PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0")
     
-    with patch('importlib.util.find_spec') as mock_find_spec:
+    with patch('importlib.util.find_spec') as mock_find_spec, \
+         patch('site.getsitepackages', return_value=[]):
         # Mock package not found
         mock_find_spec.return_value = None
         
@@ -109,14 +133,12 @@ def test_verifier_engine_verify_package_found():
         mock_find_spec.return_value = mock_spec
         mock_site.return_value = ["/path/to/site-packages"]
         
-        with patch('pathlib.Path.glob') as mock_glob:
-            # Mock no dist-info found
-            mock_glob.return_value = []
-            
-            result = engine.verify_package(pkg_id)
-            
-            assert result["package"] == str(pkg_id)
-            assert "verifications" in result
+        # Site-packages directory does not exist, so no dist-info is found
+        result = engine.verify_package(pkg_id)
+        
+        assert result["package"] == str(pkg_id)
+        assert "verifications" in result
+        assert result["verifications"]["location"]["status"] == "found"
 
 def test_verifier_engine_verify_package_with_dist_info(tmp_path):
     """Test verifying a package with dist-info directory"""
@@ -136,7 +158,7 @@ def test_verifier_engine_verify_package_with_dist_info(tmp_path):
         dist_info = tmp_path / "site-packages" / "test_package-1.0.0.dist-info"
         dist_info.mkdir(parents=True)
         metadata_file = dist_info / "METADATA"
-        metadata_file.write_text("Name: test-package\nVersion: 1.0.0\n")
+        metadata_file.write_bytes(b"Name: test-package\nVersion: 1.0.0\n")
         
         result = engine.verify_package(pkg_id)
         
@@ -165,7 +187,7 @@ def test_verifier_engine_verify_package_with_egg_info(tmp_path):
         egg_info = tmp_path / "site-packages" / "test_package-1.0.0.egg-info"
         egg_info.mkdir(parents=True)
         metadata_file = egg_info / "METADATA"
-        metadata_file.write_text("Name: test-package\nVersion: 1.0.0\n")
+        metadata_file.write_bytes(b"Name: test-package\nVersion: 1.0.0\n")
         
         result = engine.verify_package(pkg_id)
         
@@ -174,6 +196,45 @@ def test_verifier_engine_verify_package_with_egg_info(tmp_path):
         assert "metadata" in result["verifications"]
         assert result["verifications"]["metadata"]["status"] == "found"
 
+def test_verifier_engine_installed_index(tmp_path):
+    """Test the installed index prefers dist-info and normalizes project names"""
+    site_packages = tmp_path / "site-packages"
+    (site_packages / "test_package-0.9.0.egg-info").mkdir(parents=True)
+    (site_packages / "test_package-1.0.0.dist-info").mkdir()
+    (site_packages / "Other.Package-1.0.0.dist-info").mkdir()
+    (site_packages / "test_package").mkdir()
+    
+    engine = VerifierEngine()
+    
+    with patch('site.getsitepackages') as mock_site:
+        mock_site.return_value = [str(site_packages), str(tmp_path / "missing")]
+        
+        index = engine._installed_index
+    
+    assert index == {
+        "test-package": site_packages / "test_package-1.0.0.dist-info",
+        "other-package": site_packages / "Other.Package-1.0.0.dist-info",
+    }
+
+
+def test_verifier_engine_verify_package_skips_find_spec_for_indexed(tmp_path):
+    """Test packages found in site-packages do not go through the import system"""
+    engine = VerifierEngine()
+    
+    pkg_id = PackageIdentifier(ecosystem="pypi", name="Test.Package", version="1.0.0")
+    dist_info = tmp_path / "site-packages" / "test_package-1.0.0.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_bytes(b"Name: test-package\n")
+    
+    with patch('importlib.util.find_spec') as mock_find_spec, \
+         patch('site.getsitepackages') as mock_site:
+        mock_site.return_value = [str(tmp_path / "site-packages")]
+        
+        result = engine.verify_package(pkg_id)
+        
+        mock_find_spec.assert_not_called()
+        assert result["verifications"]["metadata"]["status"] == "found"
+
 def test_verifier_engine_verify_package_metadata_not_found(tmp_path):
     """Test verifying a package with dist-info but no METADATA file"""
     engine = VerifierEngine()
@@ -206,7 +267,8 @@ def test_verifier_engine_verify_package_spec_origin_none():
     
     pkg_id = PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0")
     
-    with patch('importlib.util.find_spec') as mock_find_spec:
+    with patch('importlib.util.find_spec') as mock_find_spec, \
+         patch('site.getsitepackages', return_value=[]):
         mock_spec = Mock()
         mock_spec.origin = None
         mock_find_spec.return_value = mock_spec
@@ -225,7 +287,8 @@ def test_verifier_engine_verify_package_error():
     
     pkg_id = PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0")
     
-    with patch('importlib.util.find_spec') as mock_find_spec:
+    with patch('importlib.util.find_spec') as mock_find_spec, \
+         patch('site.getsitepackages', return_value=[]):
         mock_find_spec.side_effect = Exception("Test error")
         
         result = engine.verify_package(pkg_id)
@@ -233,3 +296,138 @@ def test_verifier_engine_verify_package_error():
         assert "verifications" in result
         assert "error" in result["verifications"]
 
+
+
+def test_verifier_engine_verify_package_caches_lookups(tmp_path):
+    """Test site-packages and spec lookups happen once per engine"""
+    engine = VerifierEngine()
+    
+    pkg_id = PackageIdentifier(ecosystem="pypi", name="test-package", version="1.0.0")
+    
+    with patch('importlib.util.find_spec') as mock_find_spec, \
+         patch('site.getsitepackages') as mock_site:
+        
+        mock_spec = Mock()
+        mock_spec.origin = str(tmp_path / "test_package" / "__init__.py")
+        mock_find_spec.return_value = mock_spec
+        mock_site.return_value = [str(tmp_path / "site-packages")]
+        
+        engine.verify_package(pkg_id)
+        engine.verify_package(pkg_id)
+        
+        mock_find_spec.assert_called_once_with("test-package")
+        mock_site.assert_called_once()
+
+
+def test_verifier_engine_sub_verifiers_lazy():
+    """Test sub-verifiers are created on first access and then reused"""
+    engine = VerifierEngine()
+    
+    assert "hash_verifier" not in vars(engine)
+    assert "sigstore_verifier" not in vars(engine)
+    assert engine.hash_verifier is engine.hash_verifier
+    assert engine.sigstore_verifier is engine.sigstore_verifier
+
+
+def _record_hash(content):
+    """Encode a sha256 digest the way RECORD files store it"""
+    import base64
+    import hashlib
+    digest = hashlib.sha256(content).digest()
+    return "sha256=" + base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def test_verifier_engine_verify_package_record(tmp_path):
+    """Test installed files are checked against RECORD when enabled"""
+    site_packages = tmp_path / "site-packages"
+    package_dir = site_packages / "test_package"
+    package_dir.mkdir(parents=True)
+    init_content = b"VERSION = '1.0.0'\n"
+    (package_dir / "__init__.py").write_bytes(init_content)
+    (package_dir / "core.py").write_bytes(b"tampered\n")
+    dist_info = site_packages / "test_package-1.0.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_bytes(b"Name: test-package\nVersion: 1.0.0\n")
+    (dist_info / "RECORD").write_text(
+        f"test_package/__init__.py,{_record_hash(init_content)},{len(init_content)}\n"
+        f"test_package/core.py,{_record_hash(b'original')},8\n"
+        f"test_package/gone.py,{_record_hash(b'')},0\n"
+        "test_package/__pycache__/core.cpython-311.pyc,,\n"
+        "test_package-1.0.0.dist-info/RECORD,,\n"
+    )
+    
+    pkg_id = PackageIdentifier(ecosystem="pypi", name="test-package", version="1.0.0")
+    
+    with patch('site.getsitepackages') as mock_site:
+        mock_site.return_value = [str(site_packages)]
+        
+        default_result = VerifierEngine().verify_package(pkg_id)
+        with VerifierEngine(verify_record=True) as engine:
+            record_result = engine.verify_package(pkg_id)
+    
+    assert default_result["verifications"]["hash"]["status"] == "limited"
+    hash_result = record_result["verifications"]["hash"]
+    assert hash_result["status"] == "mismatch"
+    assert hash_result["files"] == 1
+    assert hash_result["mismatched"] == ["test_package/core.py"]
+    assert hash_result["missing"] == ["test_package/gone.py"]
+
+
+def test_verifier_engine_verify_record_per_file_errors(tmp_path):
+    """Test unreadable files and unusable digests are reported per entry"""
+    site_packages = tmp_path / "site-packages"
+    package_dir = site_packages / "test_package"
+    (package_dir / "data").mkdir(parents=True)
+    (package_dir / "__init__.py").write_bytes(b"")
+    dist_info = site_packages / "test_package-1.0.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_bytes(b"Name: test-package\nVersion: 1.0.0\n")
+    (dist_info / "RECORD").write_text(
+        f"test_package/__init__.py,{_record_hash(b'')},0\n"
+        f"test_package/data,{_record_hash(b'')},0\n"
+        "test_package/__init__.py,shake_128=AAAA,0\n"
+        "test_package/__init__.py,nosuchalgo=AAAA,0\n"
+    )
+    
+    pkg_id = PackageIdentifier(ecosystem="pypi", name="test-package", version="1.0.0")
+    
+    with patch('site.getsitepackages') as mock_site:
+        mock_site.return_value = [str(site_packages)]
+        
+        with VerifierEngine(verify_record=True) as engine:
+            result = engine.verify_package(pkg_id)
+    
+    hash_result = result["verifications"]["hash"]
+    assert "error" not in result["verifications"]
+    assert hash_result["status"] == "incomplete"
+    assert hash_result["files"] == 1
+    assert hash_result["unreadable"] == ["test_package/data"]
+    assert hash_result["unsupported"] == ["test_package/__init__.py"] * 2
+
+
+@pytest.mark.parametrize("record", [
+    pytest.param("test_package/__init__.py,md4x=AAAA,7\n", id="all_unsupported"),
+    pytest.param("test_package/__init__.py,,\n", id="no_hashes"),
+])
+def test_verifier_engine_verify_record_nothing_checked(tmp_path, record):
+    """Test a RECORD with no checkable entry is not reported as verified"""
+    site_packages = tmp_path / "site-packages"
+    package_dir = site_packages / "test_package"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").write_bytes(b"tampered")
+    dist_info = site_packages / "test_package-1.0.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_bytes(b"Name: test-package\nVersion: 1.0.0\n")
+    (dist_info / "RECORD").write_text(record)
+    
+    pkg_id = PackageIdentifier(ecosystem="pypi", name="test-package", version="1.0.0")
+    
+    with patch('site.getsitepackages') as mock_site:
+        mock_site.return_value = [str(site_packages)]
+        
+        with VerifierEngine(verify_record=True) as engine:
+            result = engine.verify_package(pkg_id)
+    
+    hash_result = result["verifications"]["hash"]
+    assert hash_result["status"] == "limited"
+    assert hash_result["files"] == 0
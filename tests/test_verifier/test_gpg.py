@@ -1,265 +1,324 @@
 """Tests for GPG verifier"""
 
+import subprocess
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
 import pytest
-from pathlib import Path
-from unittest.mock import patch, MagicMock
 
-from provchain.verifier.provenance.gpg import GPGVerifier
+from provchain.verifier.provenance.gpg import MAX_ERROR_OUTPUT, GPGVerifier
+
+
+def _fake_run(
+    version_rc=0,
+    verify_rc=0,
+    verify_stdout=b"[GNUPG:] NEWSIG\n[GNUPG:] GOODSIG ABCD1234 Test User\n",
+    verify_stderr=b"Good signature",
+    raise_on_version=None,
+    raise_on_verify=None,
+):
+    """Build a subprocess.run replacement answering gpg --version and --verify"""
+    version_result = SimpleNamespace(returncode=version_rc, stdout=b"", stderr=b"")
+    verify_result = SimpleNamespace(
+        returncode=verify_rc, stdout=verify_stdout, stderr=verify_stderr
+    )
+
+    def run(args, **kwargs):
+        if "--version" in args:
+            if raise_on_version is not None:
+                raise raise_on_version
+            return version_result
+        if raise_on_verify is not None:
+            raise raise_on_verify
+        return verify_result
+
+    return run
 
 
 class TestGPGVerifier:
     """Test cases for GPG verifier"""
 
+    @pytest.fixture(autouse=True)
+    def subprocess_backend(self, monkeypatch):
+        """Force the subprocess backend regardless of python-gnupg availability"""
+        monkeypatch.setattr('provchain.verifier.provenance.gpg.gnupg', None)
+
     def test_gpg_verifier_init(self):
         """Test GPG verifier initialization"""
         verifier = GPGVerifier()
         assert verifier is not None
 
-    def test_verify_no_signature_file(self, tmp_path):
+    def test_verify_no_signature_file(self, dummy_artifact):
         """Test verification when no signature file exists"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
-        
         verifier = GPGVerifier()
-        result = verifier.verify(artifact)
-        
+        result = verifier.verify(dummy_artifact)
+
         assert result["available"] is False
         assert result["status"] == "no_signature"
         assert "No GPG signature file found" in result["note"]
 
-    def test_verify_gpg_not_installed(self, tmp_path):
+    def test_verify_gpg_not_installed(self, dummy_artifact, dummy_signature):
         """Test verification when GPG is not installed"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
-        signature = tmp_path / "package.whl.asc"
-        signature.write_text("fake signature")
-        
-        verifier = GPGVerifier()
-        
-        with patch('provchain.verifier.provenance.gpg.subprocess.run') as mock_run:
-            mock_run.side_effect = FileNotFoundError()
-            
-            result = verifier.verify(artifact)
-            
-            assert result["available"] is False
-            assert result["status"] == "gpg_not_installed"
-
-    def test_verify_gpg_unavailable(self, tmp_path):
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   _fake_run(raise_on_version=FileNotFoundError())):
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["available"] is False
+        assert result["status"] == "gpg_not_installed"
+
+    def test_verify_gpg_unavailable(self, dummy_artifact, dummy_signature):
         """Test verification when GPG is unavailable"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
-        signature = tmp_path / "package.whl.asc"
-        signature.write_text("fake signature")
-        
-        verifier = GPGVerifier()
-        
-        with patch('provchain.verifier.provenance.gpg.subprocess.run') as mock_run:
-            # First call (--version) returns non-zero
-            mock_version_result = MagicMock()
-            mock_version_result.returncode = 1
-            mock_run.return_value = mock_version_result
-            
-            result = verifier.verify(artifact)
-            
-            assert result["available"] is False
-            assert result["status"] == "gpg_unavailable"
-
-    def test_verify_signature_success(self, tmp_path):
+        with patch('provchain.verifier.provenance.gpg.subprocess.run', _fake_run(version_rc=1)):
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["available"] is False
+        assert result["status"] == "gpg_unavailable"
+
+    def test_verify_signature_success(self, dummy_artifact, dummy_signature):
         """Test successful signature verification"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
-        signature = tmp_path / "package.whl.asc"
-        signature.write_text("fake signature")
-        
-        verifier = GPGVerifier()
-        
-        with patch('provchain.verifier.provenance.gpg.subprocess.run') as mock_run:
-            # First call (--version) succeeds
-            mock_version_result = MagicMock()
-            mock_version_result.returncode = 0
-            # Second call (--verify) succeeds
-            mock_verify_result = MagicMock()
-            mock_verify_result.returncode = 0
-            mock_verify_result.stderr = b"Good signature"
-            
-            def run_side_effect(*args, **kwargs):
-                if "--version" in args[0]:
-                    return mock_version_result
-                return mock_verify_result
-            
-            mock_run.side_effect = run_side_effect
-            
-            result = verifier.verify(artifact)
-            
-            assert result["available"] is True
-            assert result["status"] == "verified"
-            assert "verified successfully" in result["note"]
-
-    def test_verify_signature_failure(self, tmp_path):
+        with patch('provchain.verifier.provenance.gpg.subprocess.run', _fake_run()):
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["available"] is True
+        assert result["status"] == "verified"
+        assert "verified successfully" in result["note"]
+
+    def test_verify_signature_failure(self, dummy_artifact, dummy_signature):
         """Test failed signature verification"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
-        signature = tmp_path / "package.whl.asc"
-        signature.write_text("fake signature")
-        
-        verifier = GPGVerifier()
-        
-        with patch('provchain.verifier.provenance.gpg.subprocess.run') as mock_run:
-            # First call (--version) succeeds
-            mock_version_result = MagicMock()
-            mock_version_result.returncode = 0
-            # Second call (--verify) fails
-            mock_verify_result = MagicMock()
-            mock_verify_result.returncode = 1
-            mock_verify_result.stderr = b"Bad signature"
-            
-            def run_side_effect(*args, **kwargs):
-                if "--version" in args[0]:
-                    return mock_version_result
-                return mock_verify_result
-            
-            mock_run.side_effect = run_side_effect
-            
-            result = verifier.verify(artifact)
-            
-            assert result["available"] is True
-            assert result["status"] == "verification_failed"
-            assert "verification failed" in result["note"]
-
-    def test_verify_with_explicit_signature_path(self, tmp_path):
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   _fake_run(verify_rc=1,
+                             verify_stdout=b"[GNUPG:] BADSIG ABCD1234 Test User\n",
+                             verify_stderr=b"Bad signature")):
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["available"] is True
+        assert result["status"] == "verification_failed"
+        assert result["signature_status"] == "BADSIG"
+        assert "verification failed" in result["note"]
+
+    def test_verify_requires_goodsig_status(self, dummy_artifact, dummy_signature):
+        """Test a zero exit status without GOODSIG is not treated as verified"""
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   _fake_run(verify_stdout=b"[GNUPG:] NEWSIG\n")):
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["status"] == "verification_failed"
+        assert result["signature_status"] is None
+
+    def test_verify_failure_output_bounded(self, dummy_artifact, dummy_signature):
+        """Test failure output kept in the result is capped"""
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   _fake_run(verify_rc=1, verify_stderr=b"gpg: keybox debug\n" * 10000)):
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["status"] == "verification_failed"
+        assert len(result["error"]) == MAX_ERROR_OUTPUT
+
+    def test_verify_with_explicit_signature_path(self, dummy_artifact, tmp_path):
         """Test verification with explicit signature path"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
         signature = tmp_path / "custom.sig"
-        signature.write_text("fake signature")
-        
-        verifier = GPGVerifier()
-        
-        with patch('provchain.verifier.provenance.gpg.subprocess.run') as mock_run:
-            mock_version_result = MagicMock()
-            mock_version_result.returncode = 0
-            mock_verify_result = MagicMock()
-            mock_verify_result.returncode = 0
-            mock_verify_result.stderr = b"Good signature"
-            
-            def run_side_effect(*args, **kwargs):
-                if "--version" in args[0]:
-                    return mock_version_result
-                return mock_verify_result
-            
-            mock_run.side_effect = run_side_effect
-            
-            result = verifier.verify(artifact, signature)
-            
-            assert result["available"] is True
-            assert result["status"] == "verified"
-
-    def test_verify_finds_asc_signature(self, tmp_path):
+        signature.write_bytes(b"fake signature")
+
+        with patch('provchain.verifier.provenance.gpg.subprocess.run', _fake_run()):
+            result = GPGVerifier().verify(dummy_artifact, signature)
+
+        assert result["available"] is True
+        assert result["status"] == "verified"
+
+    def test_verify_finds_asc_signature(self, dummy_artifact, tmp_path):
         """Test that verifier finds .asc signature file"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
         signature = tmp_path / "package.asc"
-        signature.write_text("fake signature")
-        
-        verifier = GPGVerifier()
-        
-        with patch('provchain.verifier.provenance.gpg.subprocess.run') as mock_run:
-            mock_version_result = MagicMock()
-            mock_version_result.returncode = 0
-            mock_verify_result = MagicMock()
-            mock_verify_result.returncode = 0
-            mock_verify_result.stderr = b"Good signature"
-            
-            def run_side_effect(*args, **kwargs):
-                if "--version" in args[0]:
-                    return mock_version_result
-                return mock_verify_result
-            
-            mock_run.side_effect = run_side_effect
-            
-            result = verifier.verify(artifact)
-            
-            assert result["available"] is True
-            assert result["status"] == "verified"
-
-    def test_verify_timeout(self, tmp_path):
+        signature.write_bytes(b"fake signature")
+
+        with patch('provchain.verifier.provenance.gpg.subprocess.run', _fake_run()):
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["available"] is True
+        assert result["status"] == "verified"
+
+    def test_verify_timeout(self, dummy_artifact, dummy_signature):
         """Test verification timeout"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
-        signature = tmp_path / "package.whl.asc"
-        signature.write_text("fake signature")
-        
-        verifier = GPGVerifier()
-        
-        with patch('provchain.verifier.provenance.gpg.subprocess.run') as mock_run:
-            import subprocess
-            mock_version_result = MagicMock()
-            mock_version_result.returncode = 0
-            
-            def run_side_effect(*args, **kwargs):
-                if "--version" in args[0]:
-                    return mock_version_result
-                raise subprocess.TimeoutExpired("gpg", 30)
-            
-            mock_run.side_effect = run_side_effect
-            
-            result = verifier.verify(artifact)
-            
-            assert result["available"] is True
-            assert result["status"] == "timeout"
-
-    def test_verify_with_string_paths(self, tmp_path):
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   _fake_run(raise_on_verify=subprocess.TimeoutExpired("gpg", 30))):
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["available"] is True
+        assert result["status"] == "timeout"
+
+    def test_verify_with_string_paths(self, dummy_artifact, dummy_signature):
         """Test verification with string paths"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
-        signature = tmp_path / "package.whl.asc"
-        signature.write_text("fake signature")
-        
+        with patch('provchain.verifier.provenance.gpg.subprocess.run', _fake_run()):
+            result = GPGVerifier().verify(str(dummy_artifact), str(dummy_signature))
+
+        assert result["available"] is True
+        assert result["status"] == "verified"
+
+    def test_verify_unexpected_exception(self, dummy_artifact, dummy_signature):
+        """Test verification when an unexpected exception occurs"""
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   _fake_run(raise_on_verify=ValueError("Unexpected error"))):
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["available"] is True
+        assert result["status"] == "error"
+        assert "error" in result
+
+    def test_verify_runs_gpg_with_minimal_environment(self, dummy_artifact, dummy_signature, monkeypatch):
+        """Test gpg runs non-interactively with a trimmed, C-locale environment"""
+        monkeypatch.setenv("GNUPGHOME", "/tmp/keyring")
+        monkeypatch.setenv("PROVCHAIN_GITHUB_TOKEN", "secret")
+
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   side_effect=_fake_run()) as mock_run:
+            GPGVerifier().verify(dummy_artifact)
+
+        args, kwargs = mock_run.call_args
+        assert args[0] == (
+            "gpg", "--batch", "--status-fd", "1", "--verify", str(dummy_signature), str(dummy_artifact)
+        )
+        assert kwargs["stdin"] == subprocess.DEVNULL
+        assert kwargs["env"]["LC_ALL"] == "C"
+        assert kwargs["env"]["GNUPGHOME"] == "/tmp/keyring"
+        assert "PROVCHAIN_GITHUB_TOKEN" not in kwargs["env"]
+
+    def test_verify_does_not_cache_good_signature(self, dummy_artifact, dummy_signature):
+        """Test a GOODSIG is checked again, since the signer's key can go away"""
         verifier = GPGVerifier()
-        
-        with patch('provchain.verifier.provenance.gpg.subprocess.run') as mock_run:
-            mock_version_result = MagicMock()
-            mock_version_result.returncode = 0
-            mock_verify_result = MagicMock()
-            mock_verify_result.returncode = 0
-            mock_verify_result.stderr = b"Good signature"
-            
-            def run_side_effect(*args, **kwargs):
-                if "--version" in args[0]:
-                    return mock_version_result
-                return mock_verify_result
-            
-            mock_run.side_effect = run_side_effect
-            
-            result = verifier.verify(str(artifact), str(signature))
-            
-            assert result["available"] is True
-            assert result["status"] == "verified"
-
-    def test_verify_unexpected_exception(self, tmp_path):
-        """Test verification when an unexpected exception occurs - covers lines 88-89"""
-        artifact = tmp_path / "package.whl"
-        artifact.write_text("fake package")
-        signature = tmp_path / "package.whl.asc"
-        signature.write_text("fake signature")
-        
+
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   side_effect=_fake_run()) as mock_run:
+            first = verifier.verify(dummy_artifact)
+            calls = mock_run.call_count
+            second = verifier.verify(dummy_artifact)
+
+        assert first == second
+        assert second["status"] == "verified"
+        assert mock_run.call_count == calls + 1
+
+    def test_verify_does_not_cache_timeout(self, dummy_artifact, dummy_signature):
+        """Test transient failures are not cached"""
+        verifier = GPGVerifier()
+
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   side_effect=_fake_run(raise_on_verify=subprocess.TimeoutExpired("gpg", 30))) as mock_run:
+            assert verifier.verify(dummy_artifact)["status"] == "timeout"
+            calls = mock_run.call_count
+            assert verifier.verify(dummy_artifact)["status"] == "timeout"
+
+        assert mock_run.call_count > calls
+
+    def test_verify_caches_bad_signature(self, dummy_artifact, dummy_signature):
+        """Test a BADSIG verdict is cached like a good one"""
         verifier = GPGVerifier()
-        
+
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   side_effect=_fake_run(verify_rc=1,
+                                         verify_stdout=b"[GNUPG:] BADSIG ABCD1234 Test User\n")) as mock_run:
+            verifier.verify(dummy_artifact)
+            calls = mock_run.call_count
+            assert verifier.verify(dummy_artifact)["signature_status"] == "BADSIG"
+
+        assert mock_run.call_count == calls
+
+    @pytest.mark.parametrize("verify_stdout", [
+        pytest.param(b"[GNUPG:] ERRSIG ABCD1234 1 8 00 1700000000 9\n"
+                     b"[GNUPG:] NO_PUBKEY ABCD1234\n", id="missing_key"),
+        pytest.param(b"[GNUPG:] NEWSIG\n", id="no_verdict"),
+    ])
+    def test_verify_does_not_cache_keyring_dependent_failure(self, dummy_artifact, dummy_signature,
+                                                            verify_stdout):
+        """Test failures that importing a key could fix are checked again"""
+        verifier = GPGVerifier()
+
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   side_effect=_fake_run(verify_rc=2, verify_stdout=verify_stdout)) as mock_run:
+            assert verifier.verify(dummy_artifact)["status"] == "verification_failed"
+            calls = mock_run.call_count
+            assert verifier.verify(dummy_artifact)["status"] == "verification_failed"
+
+        assert mock_run.call_count > calls
+
+    def test_verify_gpg_not_installed_skips_hashing(self, dummy_artifact, dummy_signature):
+        """Test artifacts are not hashed when gpg cannot run"""
+        with patch('provchain.verifier.provenance.gpg.subprocess.run',
+                   _fake_run(raise_on_version=FileNotFoundError())), \
+             patch('provchain.verifier.provenance.gpg.calculate_hash') as mock_hash:
+            result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["status"] == "gpg_not_installed"
+        mock_hash.assert_not_called()
+
+
+class TestGPGVerifierGnupg:
+    """Test cases for the python-gnupg backend"""
+
+    @pytest.fixture
+    def gnupg_module(self, monkeypatch):
+        """Install a fake python-gnupg module"""
+        module = MagicMock()
+        monkeypatch.setattr('provchain.verifier.provenance.gpg.gnupg', module)
+        return module
+
+    def test_verify_signature_success(self, gnupg_module, dummy_artifact, dummy_signature):
+        """Test successful verification without spawning gpg directly"""
+        gnupg_module.GPG.return_value.verify_file.return_value = MagicMock(
+            valid=True, status="signature valid"
+        )
+
         with patch('provchain.verifier.provenance.gpg.subprocess.run') as mock_run:
-            mock_version_result = MagicMock()
-            mock_version_result.returncode = 0
-            
-            def run_side_effect(*args, **kwargs):
-                if "--version" in args[0]:
-                    return mock_version_result
-                # Raise an unexpected exception (not TimeoutExpired)
-                raise ValueError("Unexpected error")
-            
-            mock_run.side_effect = run_side_effect
-            
-            result = verifier.verify(artifact)
-            
-            assert result["available"] is True
-            assert result["status"] == "error"
-            assert "error" in result
+            result = GPGVerifier().verify(dummy_artifact)
+
+            mock_run.assert_not_called()
+
+        assert result["available"] is True
+        assert result["status"] == "verified"
+        assert result["signature_file"] == str(dummy_signature)
+        gnupg_module.GPG.return_value.verify_file.assert_called_once_with(
+            str(dummy_signature), str(dummy_artifact)
+        )
+
+    def test_verify_signature_failure(self, gnupg_module, dummy_artifact, dummy_signature):
+        """Test failed verification maps gnupg status into the result"""
+        gnupg_module.GPG.return_value.verify_file.return_value = MagicMock(
+            valid=False, status="signature bad"
+        )
+
+        result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["status"] == "verification_failed"
+        assert result["signature_status"] == "BADSIG"
+        assert result["error"] == "signature bad"
+
+    def test_verify_no_public_key_not_cached(self, gnupg_module, dummy_artifact, dummy_signature):
+        """Test a missing signer key is checked again on the next call"""
+        verify_file = gnupg_module.GPG.return_value.verify_file
+        verify_file.return_value = MagicMock(valid=False, status="no public key")
+        verifier = GPGVerifier()
+
+        verifier.verify(dummy_artifact)
+        result = verifier.verify(dummy_artifact)
+
+        assert result["signature_status"] is None
+        assert verify_file.call_count == 2
+
+    def test_verify_gpg_not_installed(self, gnupg_module, dummy_artifact, dummy_signature):
+        """Test missing gpg binary is reported when gnupg cannot start"""
+        gnupg_module.GPG.side_effect = OSError("Unable to run gpg")
+
+        result = GPGVerifier().verify(dummy_artifact)
+
+        assert result["available"] is False
+        assert result["status"] == "gpg_not_installed"
+
+    def test_gpg_handle_reused(self, gnupg_module, tmp_path):
+        """Test the gnupg handle is created once per verifier"""
+        verifier = GPGVerifier()
+        gnupg_module.GPG.return_value.verify_file.return_value = MagicMock(valid=True)
+
+        for name in ("a.whl", "b.whl"):
+            artifact = tmp_path / name
+            artifact.write_bytes(name.encode())
+            (tmp_path / f"{name}.asc").write_bytes(b"signature for " + name.encode())
+            assert verifier.verify(artifact)["status"] == "verified"
 
+        gnupg_module.GPG.assert_called_once()
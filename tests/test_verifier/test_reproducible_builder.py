@@ -1,608 +1,242 @@
 """Tests for reproducible build checker"""
 
-import subprocess
+import copy
+from contextlib import nullcontext
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, MagicMock, patch
 
 import pytest
 
+from provchain.verifier.reproducible import builder as _b
 from provchain.verifier.reproducible.builder import ReproducibleBuildChecker
 
+# Hermetic, but the module-scoped fixtures are only shared within one worker
+pytestmark = pytest.mark.xdist_group("reproducible_builder")
+
+# Captured before builder_patches replaces the builder's subprocess module
+_TimeoutExpired = _b.subprocess.TimeoutExpired
+
+# Wheel "found" in the build directory; calculate_hash is mocked, so it is never read
+_BUILT_WHEEL = Path("package-1.0.0-py3-none-any.whl")
+
+# get_package_metadata payloads, shared by every test that needs them
+_SDIST_URL = "http://example.com/package.tar.gz"
+_WHL_ONLY = {
+    "releases": {
+        "1.0.0": [{"filename": "package-1.0.0.whl", "url": "http://example.com/package.whl"}]
+    }
+}
+_SDIST_NO_URL = {"releases": {"1.0.0": [{"filename": "package-1.0.0.tar.gz"}]}}
+_ZIP_AND_WHL = {
+    "releases": {
+        "1.0.0": [
+            {"filename": "package-1.0.0.zip", "url": "http://example.com/package.zip"},
+            {"filename": "package-1.0.0.whl", "digests": {"sha256": "abc123"}},
+        ]
+    }
+}
+_TAR_AND_WHL = {
+    "releases": {
+        "1.0.0": [
+            {"filename": "package-1.0.0.tar.gz", "url": _SDIST_URL},
+            {"filename": "package-1.0.0.whl", "digests": {"sha256": "abc123"}},
+        ]
+    }
+}
+_TAR_ONLY = {"releases": {"1.0.0": [{"filename": "package-1.0.0.tar.gz", "url": _SDIST_URL}]}}
+
+_PAYLOADS = (_WHL_ONLY, _SDIST_NO_URL, _ZIP_AND_WHL, _TAR_AND_WHL, _TAR_ONLY)
+_PAYLOADS_SNAPSHOT = copy.deepcopy(_PAYLOADS)
+
+
+@pytest.fixture(autouse=True)
+def builder_patches(client_mocks, tmp_path):
+    """Patch every collaborator of the builder module in one step"""
+    client_mocks.reset()
+    with patch.multiple(
+        _b,
+        PyPIClient=DEFAULT,
+        HTTPClient=DEFAULT,
+        tarfile=DEFAULT,
+        zipfile=DEFAULT,
+        subprocess=DEFAULT,
+        tempfile=DEFAULT,
+        calculate_hash=DEFAULT,
+    ) as mocks:
+        mocks["PyPIClient"].return_value = client_mocks.pypi
+        mocks["HTTPClient"].return_value = client_mocks.http
+        mocks["tempfile"].TemporaryDirectory.return_value = nullcontext(str(tmp_path))
+        # The builder catches this, so it must stay a real exception class
+        mocks["subprocess"].TimeoutExpired = _TimeoutExpired
+        yield mocks
+    # The payloads are shared, so verify() must only ever read them
+    assert _PAYLOADS == _PAYLOADS_SNAPSHOT
+
+
+@pytest.fixture
+def clients(client_mocks, builder_patches):
+    """Shared PyPI and HTTP client doubles returned by the patched classes"""
+    return client_mocks
+
+
+@pytest.fixture
+def extracted_source(monkeypatch):
+    """List one extracted source directory without creating it on disk"""
+    source_dir = SimpleNamespace(name="package-1.0.0", is_dir=lambda: True)
+    monkeypatch.setattr(Path, "iterdir", lambda self: iter([source_dir]))
+    return source_dir
+
+
+@pytest.fixture(scope="class")
+def checker():
+    """Checker shared by the test class; it holds no per-call state"""
+    return ReproducibleBuildChecker()
+
 
 class TestReproducibleBuildChecker:
     """Test cases for ReproducibleBuildChecker"""
-
-    def test_reproducible_build_checker_init(self):
+    def test_reproducible_build_checker_init(self, checker):
         """Test ReproducibleBuildChecker initialization"""
-        checker = ReproducibleBuildChecker()
         assert checker is not None
 
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_no_source_distribution(self, mock_pypi_class):
+    def test_verify_no_source_distribution(self, clients, checker):
         """Test verify when no source distribution is available"""
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.whl", "url": "http://example.com/package.whl"}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
+        clients.pypi.get_package_metadata.return_value = _WHL_ONLY
         
-        checker = ReproducibleBuildChecker()
         result = checker.verify("test-package", "1.0.0")
         
         assert result["status"] == "no_source"
         assert "No source distribution available" in result["note"]
 
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_no_sdist_url(self, mock_pypi_class):
+    def test_verify_no_sdist_url(self, clients, checker):
         """Test verify when source distribution has no URL"""
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz"}  # No URL
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
+        clients.pypi.get_package_metadata.return_value = _SDIST_NO_URL
         
-        checker = ReproducibleBuildChecker()
         result = checker.verify("test-package", "1.0.0")
         
         assert result["status"] == "no_url"
         assert "Source distribution URL not available" in result["note"]
 
-    @patch('provchain.verifier.reproducible.builder.calculate_hash')
-    @patch('provchain.verifier.reproducible.builder.subprocess.run')
-    @patch('provchain.verifier.reproducible.builder.zipfile.ZipFile')
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_extract_zip(self, mock_pypi_class, mock_http_class,
-                                 mock_zipfile_class, mock_subprocess, mock_calculate_hash):
+    def test_verify_extract_zip(self, builder_patches, clients, checker, extracted_source):
         """Test verify with zip file extraction"""
-        # Setup PyPI client
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.zip", "url": "http://example.com/package.zip"},
-                    {"filename": "package-1.0.0.whl", "digests": {"sha256": "abc123"}}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"zip content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
-        
-        # Setup zipfile - need to mock extractall to create a directory
-        mock_zip = MagicMock()
-        def mock_extractall(path):
-            # Create a directory to simulate extraction
-            extract_path = Path(path) if isinstance(path, str) else path
-            (extract_path / "package-1.0.0").mkdir(parents=True, exist_ok=True)
-        mock_zip.extractall = mock_extractall
-        mock_zipfile_class.return_value.__enter__.return_value = mock_zip
-        mock_zipfile_class.return_value.__exit__.return_value = None
+        clients.pypi.get_package_metadata.return_value = _ZIP_AND_WHL
         
         # Setup subprocess
-        mock_subprocess.return_value = MagicMock(returncode=0)
+        builder_patches["subprocess"].run.return_value = MagicMock(returncode=0)
         
         # Setup hash calculation
-        mock_calculate_hash.return_value = "abc123"
+        builder_patches["calculate_hash"].return_value = "abc123"
         
         # Mock Path.glob to return a wheel file
-        with patch('pathlib.Path.glob') as mock_glob:
-            mock_wheel = MagicMock(spec=Path)
-            mock_wheel.__str__ = lambda x: "package-1.0.0-py3-none-any.whl"
-            mock_glob.return_value = [mock_wheel]
-            
-            checker = ReproducibleBuildChecker()
+        with patch.object(Path, 'glob', return_value=[_BUILT_WHEEL]):
             result = checker.verify("test-package", "1.0.0")
             
             # Verify zipfile was used
-            mock_zipfile_class.assert_called_once()
+            builder_patches["zipfile"].ZipFile.assert_called_once()
+            assert result["status"] == "compared"
 
-    @patch('provchain.verifier.reproducible.builder.calculate_hash')
-    @patch('provchain.verifier.reproducible.builder.subprocess.run')
-    @patch('provchain.verifier.reproducible.builder.tarfile.open')
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_extract_tar_gz(self, mock_pypi_class, mock_http_class,
-                                   mock_tarfile_open, mock_subprocess, mock_calculate_hash):
+    def test_verify_extract_tar_gz(self, builder_patches, clients, checker, extracted_source):
         """Test verify with tar.gz file extraction"""
-        # Setup PyPI client
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz", "url": "http://example.com/package.tar.gz"},
-                    {"filename": "package-1.0.0.whl", "digests": {"sha256": "abc123"}}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"tar content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
+        clients.pypi.get_package_metadata.return_value = _TAR_AND_WHL
         
-        # Setup tarfile - need to mock extractall to create a directory
+        # Setup tarfile - the extracted directory comes from extracted_source
         mock_tar = MagicMock()
-        def mock_extractall(path):
-            # Create a directory to simulate extraction
-            Path(path) / "package-1.0.0".mkdir(parents=True, exist_ok=True)
-        mock_tar.extractall = mock_extractall
-        mock_tarfile_open.return_value.__enter__.return_value = mock_tar
-        mock_tarfile_open.return_value.__exit__.return_value = None
+        mock_tar.extractall = MagicMock()
+        builder_patches["tarfile"].open.return_value.__enter__.return_value = mock_tar
+        builder_patches["tarfile"].open.return_value.__exit__.return_value = None
         
         # Setup subprocess
-        mock_subprocess.return_value = MagicMock(returncode=0)
+        builder_patches["subprocess"].run.return_value = MagicMock(returncode=0)
         
         # Setup hash calculation
-        mock_calculate_hash.return_value = "abc123"
+        builder_patches["calculate_hash"].return_value = "abc123"
         
         # Mock Path.glob to return a wheel file
-        with patch('pathlib.Path.glob') as mock_glob:
-            mock_wheel = MagicMock(spec=Path)
-            mock_wheel.__str__ = lambda x: "package-1.0.0-py3-none-any.whl"
-            mock_glob.return_value = [mock_wheel]
-            
-            checker = ReproducibleBuildChecker()
+        with patch.object(Path, 'glob', return_value=[_BUILT_WHEEL]):
             result = checker.verify("test-package", "1.0.0")
             
             # Verify tarfile was used
-            mock_tarfile_open.assert_called_once()
+            builder_patches["tarfile"].open.assert_called_once()
+            mock_tar.extractall.assert_called_once()
+            assert result["status"] == "compared"
 
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_extraction_failed(self, mock_pypi_class, mock_http_class):
+    def test_verify_extraction_failed(self, builder_patches, clients, checker):
         """Test verify when extraction fails (no extracted directories)"""
-        # Setup PyPI client
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz", "url": "http://example.com/package.tar.gz"}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"tar content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
+        clients.pypi.get_package_metadata.return_value = _TAR_ONLY
         
         # Mock tarfile to not create any directories
-        with patch('provchain.verifier.reproducible.builder.tarfile.open') as mock_tarfile:
-            mock_tar = MagicMock()
-            mock_tar.extractall = MagicMock()  # Don't create directories
-            mock_tarfile.return_value.__enter__.return_value = mock_tar
-            mock_tarfile.return_value.__exit__.return_value = None
-            
-            # Mock Path.iterdir to return empty (no extracted dirs)
-            with patch('pathlib.Path.iterdir') as mock_iterdir:
-                mock_iterdir.return_value = []
-                
-                checker = ReproducibleBuildChecker()
-                result = checker.verify("test-package", "1.0.0")
-                
-                assert result["status"] == "extraction_failed"
-                assert "Could not extract source distribution" in result["note"]
-
-    @patch('provchain.verifier.reproducible.builder.calculate_hash')
-    @patch('provchain.verifier.reproducible.builder.subprocess.run')
-    @patch('provchain.verifier.reproducible.builder.tarfile.open')
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_build_success(self, mock_pypi_class, mock_http_class,
-                                  mock_tarfile_open, mock_subprocess, mock_calculate_hash):
-        """Test verify with successful build"""
-        # Setup PyPI client
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz", "url": "http://example.com/package.tar.gz"},
-                    {"filename": "package-1.0.0.whl", "digests": {"sha256": "abc123"}}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"tar content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
-        
-        # Setup tarfile
-        mock_tar = MagicMock()
-        def mock_extractall(path):
-            extract_path = Path(path) if isinstance(path, str) else path
-            (extract_path / "package-1.0.0").mkdir(parents=True, exist_ok=True)
-        mock_tar.extractall = mock_extractall
-        mock_tarfile_open.return_value.__enter__.return_value = mock_tar
-        mock_tarfile_open.return_value.__exit__.return_value = None
-        
-        # Setup subprocess - successful build
-        mock_subprocess.return_value = MagicMock(returncode=0)
-        
-        # Setup hash calculation - matching hashes
-        mock_calculate_hash.return_value = "abc123"
-        
-        # Mock Path.glob to return a wheel file when called on build_dir
-        original_glob = Path.glob
-        def mock_glob(self, pattern):
-            if pattern == "*.whl":
-                # Return a mock wheel path
-                mock_wheel = MagicMock(spec=Path)
-                mock_wheel.__str__ = lambda x: "package-1.0.0-py3-none-any.whl"
-                return [mock_wheel]
-            return original_glob(self, pattern)
-        
-        with patch.object(Path, 'glob', mock_glob):
-            checker = ReproducibleBuildChecker()
-            result = checker.verify("test-package", "1.0.0")
-            
-            assert result["status"] == "compared"
-            assert result["reproducible"] is True
-
-    @patch('provchain.verifier.reproducible.builder.subprocess.run')
-    @patch('provchain.verifier.reproducible.builder.tarfile.open')
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_build_failed(self, mock_pypi_class, mock_http_class,
-                                  mock_tarfile_open, mock_subprocess):
-        """Test verify when build fails"""
-        # Setup PyPI client
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz", "url": "http://example.com/package.tar.gz"}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"tar content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
-        
-        # Setup tarfile
-        mock_tar = MagicMock()
-        def mock_extractall(path):
-            extract_path = Path(path) if isinstance(path, str) else path
-            (extract_path / "package-1.0.0").mkdir(parents=True, exist_ok=True)
-        mock_tar.extractall = mock_extractall
-        mock_tarfile_open.return_value.__enter__.return_value = mock_tar
-        mock_tarfile_open.return_value.__exit__.return_value = None
-        
-        # Setup subprocess - build failed
-        mock_subprocess.return_value = MagicMock(
-            returncode=1,
-            stderr=MagicMock(decode=MagicMock(return_value="Build error"))
-        )
-        
-        checker = ReproducibleBuildChecker()
-        result = checker.verify("test-package", "1.0.0")
-        
-        assert result["status"] == "build_failed"
-        assert "Failed to build package from source" in result["note"]
-
-    @patch('provchain.verifier.reproducible.builder.subprocess.run')
-    @patch('provchain.verifier.reproducible.builder.tarfile.open')
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_no_wheel_after_build(self, mock_pypi_class, mock_http_class,
-                                          mock_tarfile_open, mock_subprocess):
-        """Test verify when build succeeds but no wheel is found"""
-        # Setup PyPI client
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz", "url": "http://example.com/package.tar.gz"}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"tar content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
-        
-        # Setup tarfile
-        mock_tar = MagicMock()
-        def mock_extractall(path):
-            extract_path = Path(path) if isinstance(path, str) else path
-            (extract_path / "package-1.0.0").mkdir(parents=True, exist_ok=True)
-        mock_tar.extractall = mock_extractall
-        mock_tarfile_open.return_value.__enter__.return_value = mock_tar
-        mock_tarfile_open.return_value.__exit__.return_value = None
-        
-        # Setup subprocess - successful build
-        mock_subprocess.return_value = MagicMock(returncode=0)
-        
-        # Mock Path.glob to return empty (no wheel)
-        with patch('pathlib.Path.glob') as mock_glob:
-            mock_glob.return_value = []
-            
-            checker = ReproducibleBuildChecker()
-            result = checker.verify("test-package", "1.0.0")
-            
-            assert result["status"] == "no_wheel"
-            assert "Build succeeded but no wheel found" in result["note"]
-
-    @patch('provchain.verifier.reproducible.builder.calculate_hash')
-    @patch('provchain.verifier.reproducible.builder.subprocess.run')
-    @patch('provchain.verifier.reproducible.builder.tarfile.open')
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_hash_comparison_not_reproducible(self, mock_pypi_class,
-                                                      mock_http_class, mock_tarfile_open,
-                                                      mock_subprocess, mock_calculate_hash):
-        """Test verify when hash comparison shows not reproducible"""
-        # Setup PyPI client
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz", "url": "http://example.com/package.tar.gz"},
-                    {"filename": "package-1.0.0.whl", "digests": {"sha256": "abc123"}}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"tar content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
-        
-        # Setup tarfile
         mock_tar = MagicMock()
-        def mock_extractall(path):
-            extract_path = Path(path) if isinstance(path, str) else path
-            (extract_path / "package-1.0.0").mkdir(parents=True, exist_ok=True)
-        mock_tar.extractall = mock_extractall
-        mock_tarfile_open.return_value.__enter__.return_value = mock_tar
-        mock_tarfile_open.return_value.__exit__.return_value = None
-        
-        # Setup subprocess - successful build
-        mock_subprocess.return_value = MagicMock(returncode=0)
+        mock_tar.extractall = MagicMock()  # Don't create directories
+        builder_patches["tarfile"].open.return_value.__enter__.return_value = mock_tar
+        builder_patches["tarfile"].open.return_value.__exit__.return_value = None
         
-        # Setup hash calculation - different hashes
-        mock_calculate_hash.return_value = "def456"
-        
-        # Mock Path.glob to return a wheel file
-        with patch('pathlib.Path.glob') as mock_glob:
-            mock_wheel = MagicMock(spec=Path)
-            mock_wheel.__str__ = lambda x: "package-1.0.0-py3-none-any.whl"
-            mock_glob.return_value = [mock_wheel]
+        # Mock Path.iterdir to return empty (no extracted dirs)
+        with patch.object(Path, 'iterdir') as mock_iterdir:
+            mock_iterdir.return_value = []
             
-            checker = ReproducibleBuildChecker()
             result = checker.verify("test-package", "1.0.0")
             
-            assert result["status"] == "compared"
-            assert result["reproducible"] is False
-            assert "Package is not reproducible" in result["note"]
-
-    @patch('provchain.verifier.reproducible.builder.subprocess.run')
-    @patch('provchain.verifier.reproducible.builder.tarfile.open')
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_build_timeout(self, mock_pypi_class, mock_http_class,
-                                   mock_tarfile_open, mock_subprocess):
-        """Test verify when build times out"""
-        # Setup PyPI client
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz", "url": "http://example.com/package.tar.gz"}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"tar content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
-        
-        # Setup tarfile
-        mock_tar = MagicMock()
-        def mock_extractall(path):
-            extract_path = Path(path) if isinstance(path, str) else path
-            (extract_path / "package-1.0.0").mkdir(parents=True, exist_ok=True)
-        mock_tar.extractall = mock_extractall
-        mock_tarfile_open.return_value.__enter__.return_value = mock_tar
-        mock_tarfile_open.return_value.__exit__.return_value = None
-        
-        # Setup subprocess - timeout
-        mock_subprocess.side_effect = subprocess.TimeoutExpired("python", 300)
+            assert result["status"] == "extraction_failed"
+            assert "Could not extract source distribution" in result["note"]
+
+    @pytest.mark.parametrize("sp_effect, status, note", [
+        pytest.param(MagicMock(returncode=1, stderr=b"Build error"),
+                     "build_failed", "Failed to build package from source", id="build_failed"),
+        pytest.param(_TimeoutExpired("python", 300),
+                     "timeout", "Build process timed out", id="timeout"),
+        pytest.param(FileNotFoundError("python not found"),
+                     "build_tools_missing", "Python build module not available", id="build_tools_missing"),
+        pytest.param(MagicMock(returncode=0),
+                     "no_wheel", "Build succeeded but no wheel found", id="no_wheel"),
+    ])
+    def test_verify_build_error_paths(self, builder_patches, clients, checker, extracted_source,
+                                      sp_effect, status, note):
+        """Test verify when the build fails, times out, cannot run, or yields no wheel"""
+        clients.pypi.get_package_metadata.return_value = _TAR_ONLY
+        if isinstance(sp_effect, BaseException):
+            builder_patches["subprocess"].run.side_effect = sp_effect
+        else:
+            builder_patches["subprocess"].run.return_value = sp_effect
         
-        checker = ReproducibleBuildChecker()
         result = checker.verify("test-package", "1.0.0")
         
-        assert result["status"] == "timeout"
-        assert "Build process timed out" in result["note"]
+        assert result["status"] == status
+        assert note in result["note"]
 
-    @patch('provchain.verifier.reproducible.builder.subprocess.run')
-    @patch('provchain.verifier.reproducible.builder.tarfile.open')
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_build_tools_missing(self, mock_pypi_class, mock_http_class,
-                                        mock_tarfile_open, mock_subprocess):
-        """Test verify when build tools are missing"""
-        # Setup PyPI client
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz", "url": "http://example.com/package.tar.gz"}
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"tar content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
-        
-        # Setup tarfile
-        mock_tar = MagicMock()
-        def mock_extractall(path):
-            extract_path = Path(path) if isinstance(path, str) else path
-            (extract_path / "package-1.0.0").mkdir(parents=True, exist_ok=True)
-        mock_tar.extractall = mock_extractall
-        mock_tarfile_open.return_value.__enter__.return_value = mock_tar
-        mock_tarfile_open.return_value.__exit__.return_value = None
-        
-        # Setup subprocess - FileNotFoundError
-        mock_subprocess.side_effect = FileNotFoundError("python not found")
-        
-        checker = ReproducibleBuildChecker()
-        result = checker.verify("test-package", "1.0.0")
-        
-        assert result["status"] == "build_tools_missing"
-        assert "Python build module not available" in result["note"]
-
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_exception_handling(self, mock_pypi_class):
+    def test_verify_exception_handling(self, clients, checker):
         """Test verify when general exception occurs"""
         # Setup PyPI client to raise exception
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.side_effect = Exception("General error")
-        mock_pypi_class.return_value = mock_pypi
+        clients.pypi.__enter__.side_effect = Exception("General error")
         
-        checker = ReproducibleBuildChecker()
         result = checker.verify("test-package", "1.0.0")
         
         assert result["status"] == "error"
         assert "General error" in result["error"]
         assert "Error during reproducible build check" in result["note"]
 
-    @patch('provchain.verifier.reproducible.builder.calculate_hash')
-    @patch('provchain.verifier.reproducible.builder.subprocess.run')
-    @patch('provchain.verifier.reproducible.builder.tarfile.open')
-    @patch('provchain.verifier.reproducible.builder.HTTPClient')
-    @patch('provchain.verifier.reproducible.builder.PyPIClient')
-    def test_verify_built_no_original_wheel(self, mock_pypi_class, mock_http_class,
-                                             mock_tarfile_open, mock_subprocess, mock_calculate_hash):
-        """Test verify when package is built but no original wheel for comparison"""
-        # Setup PyPI client - no wheel in releases
-        mock_pypi = MagicMock()
-        mock_pypi.__enter__.return_value = mock_pypi
-        mock_pypi.__exit__.return_value = None
-        mock_pypi.get_package_metadata.return_value = {
-            "releases": {
-                "1.0.0": [
-                    {"filename": "package-1.0.0.tar.gz", "url": "http://example.com/package.tar.gz"}
-                    # No wheel file
-                ]
-            }
-        }
-        mock_pypi_class.return_value = mock_pypi
-        
-        # Setup HTTP client
-        mock_http = MagicMock()
-        mock_http.__enter__.return_value = mock_http
-        mock_http.__exit__.return_value = None
-        mock_response = MagicMock()
-        mock_response.content = b"tar content"
-        mock_http.get.return_value = mock_response
-        mock_http_class.return_value = mock_http
-        
-        # Setup tarfile
-        mock_tar = MagicMock()
-        def mock_extractall(path):
-            extract_path = Path(path) if isinstance(path, str) else path
-            (extract_path / "package-1.0.0").mkdir(parents=True, exist_ok=True)
-        mock_tar.extractall = mock_extractall
-        mock_tarfile_open.return_value.__enter__.return_value = mock_tar
-        mock_tarfile_open.return_value.__exit__.return_value = None
-        
-        # Setup subprocess - successful build
-        mock_subprocess.return_value = MagicMock(returncode=0)
-        
-        # Mock Path.glob to return a wheel file
-        with patch('pathlib.Path.glob') as mock_glob:
-            mock_wheel = MagicMock(spec=Path)
-            mock_wheel.__str__ = lambda x: "package-1.0.0-py3-none-any.whl"
-            mock_glob.return_value = [mock_wheel]
-            
-            checker = ReproducibleBuildChecker()
+    @pytest.mark.parametrize("metadata, built_hash, status, reproducible, note", [
+        pytest.param(_TAR_AND_WHL, "abc123", "compared", True,
+                     "Package is reproducible", id="reproducible"),
+        pytest.param(_TAR_AND_WHL, "def456", "compared", False,
+                     "Package is not reproducible", id="not_reproducible"),
+        pytest.param(_TAR_ONLY, "abc123", "built", None,
+                     "Package built successfully but comparison not available", id="no_original_wheel"),
+    ])
+    def test_verify_built_wheel(self, builder_patches, clients, checker, extracted_source,
+                                metadata, built_hash, status, reproducible, note):
+        """Test verify compares a built wheel with PyPI's, when PyPI has one"""
+        clients.pypi.get_package_metadata.return_value = metadata
+        builder_patches["subprocess"].run.return_value = MagicMock(returncode=0)
+        builder_patches["calculate_hash"].return_value = built_hash
+        
+        with patch.object(Path, 'glob', return_value=[_BUILT_WHEEL]):
             result = checker.verify("test-package", "1.0.0")
-            
-            assert result["status"] == "built"
-            assert "Package built successfully but comparison not available" in result["note"]
+        
+        assert result["status"] == status
+        assert result.get("reproducible") is reproducible
+        assert note in result["note"]
+        if status == "compared":
+            builder_patches["calculate_hash"].assert_called_once_with(_BUILT_WHEEL, "sha256")
+        else:
+            builder_patches["calculate_hash"].assert_not_called()
@@ -1,6 +1,7 @@
 """Tests for alert handlers"""
 
-from unittest.mock import patch, MagicMock
+import smtplib
+from unittest.mock import Mock
 from datetime import datetime, timezone
 
 import pytest
@@ -12,13 +13,14 @@ from provchain.watchdog.alerts.webhook import WebhookAlerter
 from provchain.data.models import Alert, PackageIdentifier, RiskLevel
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_alert():
-    """Sample alert for testing"""
-    return Alert(
+    """Sample alert for testing; shared, so tests must copy it to vary fields"""
+    # Known-good values, so Pydantic validation is skipped
+    return Alert.model_construct(
         id="test-alert-1",
         timestamp=datetime.now(timezone.utc),
-        package=PackageIdentifier(ecosystem="pypi", name="test-package", version="1.0.0"),
+        package=PackageIdentifier.model_construct(ecosystem="pypi", name="test-package", version="1.0.0"),
         alert_type="cve",
         severity=RiskLevel.HIGH,
         title="Test Alert",
@@ -28,208 +30,194 @@ def sample_alert():
     )
 
 
+@pytest.fixture
+def alert_with_action(sample_alert):
+    """Copy of sample_alert with its own recommended action"""
+    return sample_alert.model_copy(update={"recommended_action": "Update immediately"})
+
+
+@pytest.fixture
+def email_alerter():
+    """Email alerter pointed at a test SMTP server"""
+    return EmailAlerter(
+        smtp_server="smtp.example.com",
+        smtp_port=587,
+        username="user@example.com",
+        password="password",
+        from_email="from@example.com",
+        to_email="to@example.com",
+    )
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    """Patch smtplib.SMTP, returning the class mock and the connected server"""
+    # Specced Mocks are cheaper than MagicMocks and reject misspelt methods
+    server = Mock(spec=smtplib.SMTP)
+    connection = Mock(spec=smtplib.SMTP)
+    connection.__enter__ = Mock(return_value=server)
+    connection.__exit__ = Mock(return_value=None)
+    smtp_class = Mock(spec=smtplib.SMTP, return_value=connection)
+    monkeypatch.setattr(smtplib, "SMTP", smtp_class)
+    return smtp_class, server
+
+
+@pytest.fixture
+def post_mock(monkeypatch):
+    """Replace httpx.post, which the Slack and webhook alerters send through"""
+    mock = Mock(spec=httpx.post)
+    monkeypatch.setattr(httpx, "post", mock)
+    return mock
+
+
+@pytest.fixture(scope="module")
+def slack_alerter():
+    """Slack alerter; it holds only its webhook URL"""
+    return SlackAlerter(webhook_url="https://hooks.slack.com/test")
+
+
+@pytest.fixture(scope="module")
+def webhook_alerter():
+    """Webhook alerter; it holds only its webhook URL"""
+    return WebhookAlerter(webhook_url="https://example.com/webhook")
+
+
 class TestEmailAlerter:
     """Test cases for EmailAlerter"""
 
-    def test_email_alerter_init(self):
+    def test_email_alerter_init(self, email_alerter):
         """Test EmailAlerter initialization"""
-        alerter = EmailAlerter(
-            smtp_server="smtp.example.com",
-            smtp_port=587,
-            username="user@example.com",
-            password="password",
-            from_email="from@example.com",
-            to_email="to@example.com",
-        )
-        assert alerter.smtp_server == "smtp.example.com"
-        assert alerter.smtp_port == 587
-        assert alerter.username == "user@example.com"
-        assert alerter.from_email == "from@example.com"
-        assert alerter.to_email == "to@example.com"
-
-    def test_email_alerter_send_success(self, sample_alert):
+        assert email_alerter.smtp_server == "smtp.example.com"
+        assert email_alerter.smtp_port == 587
+        assert email_alerter.username == "user@example.com"
+        assert email_alerter.from_email == "from@example.com"
+        assert email_alerter.to_email == "to@example.com"
+
+    def test_email_alerter_send_success(self, email_alerter, sample_alert, smtp):
         """Test successful email alert sending"""
-        alerter = EmailAlerter(
-            smtp_server="smtp.example.com",
-            smtp_port=587,
-            username="user@example.com",
-            password="password",
-            from_email="from@example.com",
-            to_email="to@example.com",
-        )
+        mock_smtp, mock_server = smtp
         
-        with patch('smtplib.SMTP') as mock_smtp:
-            mock_server = MagicMock()
-            mock_smtp.return_value.__enter__.return_value = mock_server
-            mock_smtp.return_value.__exit__.return_value = None
-            
-            alerter.send(sample_alert)
-            
-            mock_smtp.assert_called_once_with("smtp.example.com", 587)
-            mock_server.starttls.assert_called_once()
-            mock_server.login.assert_called_once_with("user@example.com", "password")
-            mock_server.send_message.assert_called_once()
-
-    def test_email_alerter_send_error_handling(self, sample_alert):
+        email_alerter.send(sample_alert)
+        
+        mock_smtp.assert_called_once_with("smtp.example.com", 587)
+        mock_server.starttls.assert_called_once()
+        mock_server.login.assert_called_once_with("user@example.com", "password")
+        mock_server.send_message.assert_called_once()
+
+    def test_email_alerter_send_error_handling(self, email_alerter, sample_alert, smtp):
         """Test email alert error handling"""
-        alerter = EmailAlerter(
-            smtp_server="smtp.example.com",
-            smtp_port=587,
-            username="user@example.com",
-            password="password",
-            from_email="from@example.com",
-            to_email="to@example.com",
-        )
+        mock_smtp, _ = smtp
+        mock_smtp.side_effect = Exception("SMTP error")
         
-        with patch('smtplib.SMTP', side_effect=Exception("SMTP error")):
-            # Should not raise exception
-            alerter.send(sample_alert)
+        # Should not raise exception
+        email_alerter.send(sample_alert)
 
-    def test_email_alerter_message_content(self, sample_alert):
+    def test_email_alerter_message_content(self, email_alerter, sample_alert, smtp):
         """Test email message content formatting"""
-        alerter = EmailAlerter(
-            smtp_server="smtp.example.com",
-            smtp_port=587,
-            username="user@example.com",
-            password="password",
-            from_email="from@example.com",
-            to_email="to@example.com",
-        )
+        _, mock_server = smtp
+        
+        email_alerter.send(sample_alert)
         
-        with patch('smtplib.SMTP') as mock_smtp:
-            mock_server = MagicMock()
-            mock_smtp.return_value.__enter__.return_value = mock_server
-            mock_smtp.return_value.__exit__.return_value = None
-            
-            alerter.send(sample_alert)
-            
-            # Verify message was created
-            call_args = mock_server.send_message.call_args
-            assert call_args is not None
-            msg = call_args[0][0]
-            assert "HIGH" in msg["Subject"]
-            assert sample_alert.title in msg["Subject"]
-            assert msg["From"] == "from@example.com"
-            assert msg["To"] == "to@example.com"
-            # Check body contains alert information
-            body = str(msg.get_payload())
-            assert sample_alert.description in body
+        # Verify message was created
+        call_args = mock_server.send_message.call_args
+        assert call_args is not None
+        msg = call_args[0][0]
+        assert "HIGH" in msg["Subject"]
+        assert sample_alert.title in msg["Subject"]
+        assert msg["From"] == "from@example.com"
+        assert msg["To"] == "to@example.com"
+        # Check body contains alert information
+        body = str(msg.get_payload())
+        assert sample_alert.description in body
 
 
 class TestSlackAlerter:
     """Test cases for SlackAlerter"""
 
-    def test_slack_alerter_init(self):
+    def test_slack_alerter_init(self, slack_alerter):
         """Test SlackAlerter initialization"""
-        alerter = SlackAlerter(webhook_url="https://hooks.slack.com/test")
-        assert alerter.webhook_url == "https://hooks.slack.com/test"
+        assert slack_alerter.webhook_url == "https://hooks.slack.com/test"
 
-    def test_slack_alerter_send_success(self, sample_alert):
+    def test_slack_alerter_send_success(self, slack_alerter, sample_alert, post_mock):
         """Test successful Slack alert sending"""
-        alerter = SlackAlerter(webhook_url="https://hooks.slack.com/test")
+        slack_alerter.send(sample_alert)
         
-        with patch('httpx.post') as mock_post:
-            alerter.send(sample_alert)
-            
-            mock_post.assert_called_once()
-            call_args = mock_post.call_args
-            assert call_args[0][0] == "https://hooks.slack.com/test"
-            assert "json" in call_args[1]
-            payload = call_args[1]["json"]
-            assert "attachments" in payload
-            assert payload["attachments"][0]["title"] == sample_alert.title
-
-    def test_slack_alerter_send_error_handling(self, sample_alert):
+        post_mock.assert_called_once()
+        call_args = post_mock.call_args
+        assert call_args[0][0] == "https://hooks.slack.com/test"
+        assert "json" in call_args[1]
+        payload = call_args[1]["json"]
+        assert "attachments" in payload
+        assert payload["attachments"][0]["title"] == sample_alert.title
+
+    def test_slack_alerter_send_error_handling(self, slack_alerter, sample_alert, post_mock):
         """Test Slack alert error handling"""
-        alerter = SlackAlerter(webhook_url="https://hooks.slack.com/test")
+        post_mock.side_effect = Exception("Network error")
         
-        with patch('httpx.post', side_effect=Exception("Network error")):
-            # Should not raise exception
-            alerter.send(sample_alert)
-
-    def test_slack_alerter_severity_colors(self, sample_alert):
+        # Should not raise exception
+        slack_alerter.send(sample_alert)
+
+    @pytest.mark.parametrize("severity, color", [
+        (RiskLevel.CRITICAL, "danger"),
+        (RiskLevel.HIGH, "warning"),
+        (RiskLevel.LOW, "good"),
+    ])
+    def test_slack_alerter_severity_colors(self, slack_alerter, sample_alert, post_mock,
+                                           severity, color):
         """Test Slack alert severity color mapping"""
-        alerter = SlackAlerter(webhook_url="https://hooks.slack.com/test")
+        slack_alerter.send(sample_alert.model_copy(update={"severity": severity}))
         
-        with patch('httpx.post') as mock_post:
-            # Test critical severity
-            sample_alert.severity = RiskLevel.CRITICAL
-            alerter.send(sample_alert)
-            payload = mock_post.call_args[1]["json"]
-            assert payload["attachments"][0]["color"] == "danger"
-            
-            # Test high severity
-            sample_alert.severity = RiskLevel.HIGH
-            alerter.send(sample_alert)
-            payload = mock_post.call_args[1]["json"]
-            assert payload["attachments"][0]["color"] == "warning"
-            
-            # Test low severity
-            sample_alert.severity = RiskLevel.LOW
-            alerter.send(sample_alert)
-            payload = mock_post.call_args[1]["json"]
-            assert payload["attachments"][0]["color"] == "good"
-
-    def test_slack_alerter_with_recommended_action(self, sample_alert):
+        payload = post_mock.call_args[1]["json"]
+        assert payload["attachments"][0]["color"] == color
+
+    def test_slack_alerter_with_recommended_action(self, slack_alerter, alert_with_action, post_mock):
         """Test Slack alert with recommended action"""
-        alerter = SlackAlerter(webhook_url="https://hooks.slack.com/test")
-        sample_alert.recommended_action = "Update immediately"
-        
-        with patch('httpx.post') as mock_post:
-            alerter.send(sample_alert)
-            payload = mock_post.call_args[1]["json"]
-            fields = payload["attachments"][0]["fields"]
-            assert any(f["title"] == "Recommended Action" for f in fields)
+        slack_alerter.send(alert_with_action)
+        payload = post_mock.call_args[1]["json"]
+        fields = payload["attachments"][0]["fields"]
+        assert any(f["title"] == "Recommended Action" for f in fields)
 
 
 class TestWebhookAlerter:
     """Test cases for WebhookAlerter"""
 
-    def test_webhook_alerter_init(self):
+    def test_webhook_alerter_init(self, webhook_alerter):
         """Test WebhookAlerter initialization"""
-        alerter = WebhookAlerter(webhook_url="https://example.com/webhook")
-        assert alerter.webhook_url == "https://example.com/webhook"
+        assert webhook_alerter.webhook_url == "https://example.com/webhook"
 
-    def test_webhook_alerter_send_success(self, sample_alert):
+    def test_webhook_alerter_send_success(self, webhook_alerter, sample_alert, post_mock):
         """Test successful webhook alert sending"""
-        alerter = WebhookAlerter(webhook_url="https://example.com/webhook")
+        webhook_alerter.send(sample_alert)
         
-        with patch('httpx.post') as mock_post:
-            alerter.send(sample_alert)
-            
-            mock_post.assert_called_once()
-            call_args = mock_post.call_args
-            assert call_args[0][0] == "https://example.com/webhook"
-            assert "json" in call_args[1]
-            payload = call_args[1]["json"]
-            assert payload["id"] == sample_alert.id
-            assert payload["package"] == str(sample_alert.package)
-            assert payload["alert_type"] == sample_alert.alert_type
-            assert payload["severity"] == sample_alert.severity.value
-
-    def test_webhook_alerter_send_error_handling(self, sample_alert):
+        post_mock.assert_called_once()
+        call_args = post_mock.call_args
+        assert call_args[0][0] == "https://example.com/webhook"
+        assert "json" in call_args[1]
+        payload = call_args[1]["json"]
+        assert payload["id"] == sample_alert.id
+        assert payload["package"] == str(sample_alert.package)
+        assert payload["alert_type"] == sample_alert.alert_type
+        assert payload["severity"] == sample_alert.severity.value
+
+    def test_webhook_alerter_send_error_handling(self, webhook_alerter, sample_alert, post_mock):
         """Test webhook alert error handling"""
-        alerter = WebhookAlerter(webhook_url="https://example.com/webhook")
+        post_mock.side_effect = Exception("Network error")
         
-        with patch('httpx.post', side_effect=Exception("Network error")):
-            # Should not raise exception
-            alerter.send(sample_alert)
+        # Should not raise exception
+        webhook_alerter.send(sample_alert)
 
-    def test_webhook_alerter_payload_structure(self, sample_alert):
+    def test_webhook_alerter_payload_structure(self, webhook_alerter, sample_alert, post_mock):
         """Test webhook alert payload structure"""
-        alerter = WebhookAlerter(webhook_url="https://example.com/webhook")
+        webhook_alerter.send(sample_alert)
+        payload = post_mock.call_args[1]["json"]
         
-        with patch('httpx.post') as mock_post:
-            alerter.send(sample_alert)
-            payload = mock_post.call_args[1]["json"]
-            
-            assert "id" in payload
-            assert "timestamp" in payload
-            assert "package" in payload
-            assert "alert_type" in payload
-            assert "severity" in payload
-            assert "title" in payload
-            assert "description" in payload
-            assert "evidence" in payload
-            assert "recommended_action" in payload
+        assert "id" in payload
+        assert "timestamp" in payload
+        assert "package" in payload
+        assert "alert_type" in payload
+        assert "severity" in payload
+        assert "title" in payload
+        assert "description" in payload
+        assert "evidence" in payload
+        assert "recommended_action" in payload
 
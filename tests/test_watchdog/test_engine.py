@@ -1,29 +1,55 @@
 """Tests for watchdog engine"""
 
+import asyncio
+import logging
+
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import Mock, AsyncMock
 from datetime import timedelta
 
-from provchain.data.models import SBOM, PackageIdentifier
+from provchain.data.models import SBOM, Alert, PackageIdentifier, RiskLevel
 from provchain.watchdog.engine import WatchdogEngine
 
 
+# Keeps the daemon tests, and the engine and database they share, on one
+# xdist worker while the rest of the suite runs alongside
+pytestmark = pytest.mark.xdist_group(name="watchdog_daemon")
+
+# Read-only payloads shared by the tests
+_REQUESTS_PKG = PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0")
+_REQUESTS_SBOM = SBOM(name="test-project", packages=[_REQUESTS_PKG])
+_TEST_ALERT = Alert(
+    id="test-alert-1",
+    package=_REQUESTS_PKG,
+    alert_type="maintainer_change",
+    severity=RiskLevel.MEDIUM,
+    title="Test Alert",
+    description="Test description",
+)
+
+
+@pytest.fixture(scope="module")
+def shared_engine(temp_db_module):
+    """Engine shared by the tests that stub out its monitors"""
+    return WatchdogEngine(temp_db_module, check_interval_minutes=1)
+
+
 @pytest.fixture
-def sample_sbom():
-    """Sample SBOM for testing"""
-    return SBOM(
-        name="test-project",
-        packages=[
-            PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0")
-        ],
-    )
+def engine(shared_engine, monkeypatch):
+    """The shared engine with stubbed monitor checks, restored after each test"""
+    monkeypatch.setattr(shared_engine.maintainer_monitor, "check", AsyncMock(return_value=[]))
+    monkeypatch.setattr(shared_engine.cve_monitor, "check", AsyncMock(return_value=[]))
+    # Re-set to their current values so monkeypatch undoes any test's changes
+    monkeypatch.setattr(shared_engine, "running", shared_engine.running)
+    monkeypatch.setattr(shared_engine, "check_interval", shared_engine.check_interval)
+    return shared_engine
 
 
-def test_watchdog_engine_init(temp_db):
+def test_watchdog_engine_init(temp_db_module):
     """Test watchdog engine initialization"""
-    engine = WatchdogEngine(temp_db)
+    engine = WatchdogEngine(temp_db_module)
     
-    assert engine.db == temp_db
+    assert engine.db == temp_db_module
     assert engine.running is False
     assert engine.maintainer_monitor is not None
     assert engine.repo_monitor is not None
@@ -31,30 +57,24 @@ def test_watchdog_engine_init(temp_db):
     assert engine.cve_monitor is not None
 
 
-def test_watchdog_engine_init_with_token(temp_db):
+def test_watchdog_engine_init_with_token(temp_db_module):
     """Test watchdog engine initialization with GitHub token"""
-    engine = WatchdogEngine(temp_db, github_token="test-token")
+    engine = WatchdogEngine(temp_db_module, github_token="test-token")
     
     assert engine.github_token == "test-token"
 
 
-def test_watchdog_engine_init_custom_interval(temp_db):
+def test_watchdog_engine_init_custom_interval(temp_db_module):
     """Test watchdog engine initialization with custom check interval"""
-    engine = WatchdogEngine(temp_db, check_interval_minutes=30)
+    engine = WatchdogEngine(temp_db_module, check_interval_minutes=30)
     
     assert engine.check_interval.total_seconds() == 30 * 60
 
 
-@pytest.mark.asyncio
-async def test_watchdog_engine_check_sbom(sample_sbom, temp_db):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_watchdog_engine_check_sbom(engine):
     """Test checking SBOM for alerts"""
-    engine = WatchdogEngine(temp_db)
-    
-    # Mock monitors to return empty alerts
-    engine.maintainer_monitor.check = AsyncMock(return_value=[])
-    engine.cve_monitor.check = AsyncMock(return_value=[])
-    
-    alerts = await engine.check_sbom(sample_sbom)
+    alerts = await engine.check_sbom(_REQUESTS_SBOM)
     
     assert isinstance(alerts, list)
     assert len(alerts) == 0
@@ -62,35 +82,23 @@ async def test_watchdog_engine_check_sbom(sample_sbom, temp_db):
     engine.cve_monitor.check.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_watchdog_engine_check_sbom_with_alerts(sample_sbom, temp_db):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_watchdog_engine_check_sbom_with_alerts(engine):
     """Test checking SBOM that generates alerts"""
-    from provchain.data.models import Alert, RiskLevel
-    
-    test_alert = Alert(
-        id="test-alert-1",
-        package=PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0"),
-        alert_type="maintainer_change",
-        severity=RiskLevel.MEDIUM,
-        title="Test Alert",
-        description="Test description",
-    )
+    # Own id: the database is shared, and the daemon tests store _TEST_ALERT
+    alert = _TEST_ALERT.model_copy(update={"id": "check-sbom-alert"})
+    engine.maintainer_monitor.check.return_value = [alert]
     
-    engine = WatchdogEngine(temp_db)
-    engine.maintainer_monitor.check = AsyncMock(return_value=[test_alert])
-    engine.cve_monitor.check = AsyncMock(return_value=[])
-    
-    alerts = await engine.check_sbom(sample_sbom)
+    alerts = await engine.check_sbom(_REQUESTS_SBOM)
     
     assert len(alerts) == 1
-    assert alerts[0].id == "test-alert-1"
+    assert alerts[0].id == "check-sbom-alert"
     # Should be stored in database
-    assert temp_db.get_unresolved_alerts()
+    assert "check-sbom-alert" in {a.id for a in engine.db.get_unresolved_alerts()}
 
 
-def test_watchdog_engine_stop(temp_db):
+def test_watchdog_engine_stop(engine):
     """Test stopping watchdog engine"""
-    engine = WatchdogEngine(temp_db)
     engine.running = True
     
     engine.stop()
@@ -98,142 +106,107 @@ def test_watchdog_engine_stop(temp_db):
     assert engine.running is False
 
 
-@pytest.mark.asyncio
-async def test_watchdog_engine_run_daemon(sample_sbom, temp_db):
+# The daemon loops over its monitors' checks, so its tests use plain coroutine
+# stubs rather than AsyncMock and its per-call bookkeeping
+_EMPTY: list = []
+
+
+async def _no_alerts(*args, **kwargs):
+    """Monitor check stub that never finds anything"""
+    return _EMPTY
+
+
+async def _cancel(task):
+    """Cancel a daemon task left sleeping before its retry"""
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def _run_daemon_until(engine, checked, timeout=2.0):
+    """Run the daemon until a check sets `checked`, then stop it and wait
+    for it to return; the task is cancelled if that doesn't happen in time"""
+    daemon_task = asyncio.create_task(engine.run_daemon(_REQUESTS_SBOM))
+    try:
+        await asyncio.wait_for(checked.wait(), timeout)
+        engine.stop()
+        await asyncio.wait_for(daemon_task, timeout)
+    finally:
+        if not daemon_task.done():
+            await _cancel(daemon_task)
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_watchdog_engine_run_daemon(engine, monkeypatch):
     """Test running watchdog daemon (short run)"""
-    engine = WatchdogEngine(temp_db, check_interval_minutes=1)
-    engine.maintainer_monitor.check = AsyncMock(return_value=[])
-    engine.cve_monitor.check = AsyncMock(return_value=[])
+    checked = asyncio.Event()
+    calls = 0
     
-    # Set a very short interval for testing
-    engine.check_interval = timedelta(seconds=0.1)
+    async def check(*args):
+        nonlocal calls
+        calls += 1
+        checked.set()
+        return _EMPTY
     
-    # Run daemon for a very short time
-    import asyncio
+    monkeypatch.setattr(engine.maintainer_monitor, "check", check)
+    monkeypatch.setattr(engine.cve_monitor, "check", _no_alerts)
+    # Yield between checks without waiting
+    engine.check_interval = timedelta(0)
     
-    async def stop_soon():
-        await asyncio.sleep(0.15)
-        engine.stop()
+    # Stop as soon as the first check has run rather than after a fixed delay
+    await _run_daemon_until(engine, checked)
     
-    # Start daemon and stop task
-    daemon_task = asyncio.create_task(engine.run_daemon(sample_sbom))
-    stop_task = asyncio.create_task(stop_soon())
+    assert calls >= 1
+    assert engine.running is False
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_watchdog_engine_run_daemon_with_alerts(engine, monkeypatch, caplog):
+    """Test run_daemon with alerts - covers lines 68-70"""
+    checked = asyncio.Event()
     
-    # Wait for stop
-    await stop_task
-    # Give daemon a moment to check and exit
-    await asyncio.sleep(0.1)
+    async def check(*args):
+        checked.set()
+        return [_TEST_ALERT]
     
-    # Cancel daemon if still running
-    if not daemon_task.done():
-        daemon_task.cancel()
-        try:
-            await daemon_task
-        except asyncio.CancelledError:
-            pass
+    monkeypatch.setattr(engine.maintainer_monitor, "check", check)
+    monkeypatch.setattr(engine.cve_monitor, "check", _no_alerts)
+    engine.check_interval = timedelta(0)
     
-    # Verify it was running (should have checked at least once or stopped)
-    assert not engine.running or engine.maintainer_monitor.check.called
+    caplog.set_level(logging.WARNING, logger="provchain.watchdog.engine")
+    await _run_daemon_until(engine, checked)
+    
+    # Verify the alert was logged (lines 68-70)
+    assert any(
+        r.levelno == logging.WARNING and "Alert: Test Alert" in r.getMessage()
+        for r in caplog.records
+    )
 
 
-@pytest.mark.asyncio
-async def test_watchdog_engine_run_daemon_with_alerts(sample_sbom, temp_db):
-    """Test run_daemon with alerts - covers lines 68-70"""
-    from provchain.data.models import Alert, RiskLevel
-    
-    test_alert = Alert(
-        id="test-alert-1",
-        package=PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0"),
-        alert_type="maintainer_change",
-        severity=RiskLevel.MEDIUM,
-        title="Test Alert",
-        description="Test description",
-    )
-    
-    engine = WatchdogEngine(temp_db, check_interval_minutes=1)
-    engine.maintainer_monitor.check = AsyncMock(return_value=[test_alert])
-    engine.cve_monitor.check = AsyncMock(return_value=[])
-    
-    # Set a very short interval for testing
-    engine.check_interval = timedelta(seconds=0.1)
-    
-    # Mock print to capture output
-    with patch('builtins.print') as mock_print:
-        # Run daemon for a very short time
-        import asyncio
-        
-        async def stop_soon():
-            await asyncio.sleep(0.15)
-            engine.stop()
-        
-        # Start daemon and stop task
-        daemon_task = asyncio.create_task(engine.run_daemon(sample_sbom))
-        stop_task = asyncio.create_task(stop_soon())
-        
-        # Wait for stop
-        await stop_task
-        # Give daemon a moment to check and exit
-        await asyncio.sleep(0.1)
-        
-        # Cancel daemon if still running
-        if not daemon_task.done():
-            daemon_task.cancel()
-            try:
-                await daemon_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Verify alert was printed (lines 68-70)
-        assert mock_print.called
-        # Check that alert message was printed
-        print_calls = [str(call) for call in mock_print.call_args_list]
-        assert any("Alert:" in str(call) for call in print_calls)
-
-
-@pytest.mark.asyncio
-async def test_watchdog_engine_run_daemon_exception_handling(sample_sbom, temp_db):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_watchdog_engine_run_daemon_exception_handling(engine, monkeypatch, caplog):
     """Test run_daemon exception handling - covers lines 74-77"""
-    engine = WatchdogEngine(temp_db, check_interval_minutes=1)
+    checked = asyncio.Event()
     
     # Make check_sbom raise an exception
     async def failing_check_sbom(sbom):
+        checked.set()
         raise Exception("Test error")
     
-    engine.check_sbom = failing_check_sbom
-    
-    # Set a very short interval for testing
-    engine.check_interval = timedelta(seconds=0.1)
-    
-    # Mock print to capture error output
-    with patch('builtins.print') as mock_print:
-        # Run daemon for a very short time
-        import asyncio
-        
-        async def stop_soon():
-            await asyncio.sleep(0.2)  # Give time for exception to be caught
-            engine.stop()
-        
-        # Start daemon and stop task
-        daemon_task = asyncio.create_task(engine.run_daemon(sample_sbom))
-        stop_task = asyncio.create_task(stop_soon())
-        
-        # Wait for stop
-        await stop_task
-        # Give daemon a moment to handle exception and exit
-        await asyncio.sleep(0.1)
-        
-        # Cancel daemon if still running
-        if not daemon_task.done():
-            daemon_task.cancel()
-            try:
-                await daemon_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Verify error was printed (lines 74-77)
-        assert mock_print.called
-        # Check that error message was printed
-        print_calls = [str(call) for call in mock_print.call_args_list]
-        assert any("Watchdog error:" in str(call) for call in print_calls)
-        assert any("Test error" in str(call) for call in print_calls)
-
+    monkeypatch.setattr(engine, "check_sbom", failing_check_sbom)
+    
+    caplog.set_level(logging.ERROR, logger="provchain.watchdog.engine")
+    daemon_task = asyncio.create_task(engine.run_daemon(_REQUESTS_SBOM))
+    await asyncio.wait_for(checked.wait(), timeout=2.0)
+    engine.stop()
+    # The error path waits a fixed minute before retrying, so the daemon
+    # only returns once cancelled
+    await _cancel(daemon_task)
+    
+    # Verify the error was logged (lines 74-77)
+    assert any(
+        r.levelno == logging.ERROR and r.getMessage() == "Watchdog error: Test error"
+        for r in caplog.records
+    )
@@ -1,175 +1,165 @@
 """Tests for watchdog monitors"""
 
 import pytest
-from unittest.mock import Mock, AsyncMock, patch, MagicMock
+from unittest.mock import Mock, AsyncMock, MagicMock
 from datetime import datetime, timedelta, timezone
 
 from provchain.data.models import SBOM, PackageIdentifier, RiskLevel
+from provchain.watchdog.monitors import cve, maintainer, release, repo
 from provchain.watchdog.monitors.release import ReleaseMonitor
 from provchain.watchdog.monitors.cve import CVEMonitor
 from provchain.watchdog.monitors.maintainer import MaintainerMonitor
 from provchain.watchdog.monitors.repo import RepositoryMonitor
 
 
-def test_release_monitor_init(temp_db):
+# Read-only payloads shared by the tests
+_REQUESTS_PKG = PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0")
+_REQUESTS_SBOM = SBOM(name="test-project", packages=[_REQUESTS_PKG])
+
+
+def _patch_client(monkeypatch, module, name):
+    """Replace a client class on a monitor module with a MagicMock"""
+    client_class = MagicMock()
+    monkeypatch.setattr(module, name, client_class)
+    return client_class
+
+
+@pytest.fixture
+def release_pypi(monkeypatch):
+    """PyPIClient class used by the release monitor"""
+    return _patch_client(monkeypatch, release, "PyPIClient")
+
+
+@pytest.fixture
+def maintainer_pypi(monkeypatch):
+    """PyPIClient class used by the maintainer monitor"""
+    return _patch_client(monkeypatch, maintainer, "PyPIClient")
+
+
+@pytest.fixture
+def cve_http(monkeypatch):
+    """HTTPClient class used by the CVE monitor"""
+    return _patch_client(monkeypatch, cve, "HTTPClient")
+
+
+@pytest.fixture
+def repo_github(monkeypatch):
+    """GitHubClient class used by the repository monitor"""
+    return _patch_client(monkeypatch, repo, "GitHubClient")
+
+
+# Monitors other than MaintainerMonitor never touch the database, so one
+# instance of each, on one database, serves the whole module
+@pytest.fixture(scope="module")
+def release_monitor(temp_db_module):
+    """Release monitor shared across the module"""
+    return ReleaseMonitor(temp_db_module)
+
+
+@pytest.fixture(scope="module")
+def cve_monitor(temp_db_module):
+    """CVE monitor shared across the module"""
+    return CVEMonitor(temp_db_module)
+
+
+@pytest.fixture(scope="module")
+def repo_monitor(temp_db_module):
+    """Repository monitor shared across the module"""
+    return RepositoryMonitor(temp_db_module)
+
+
+def test_release_monitor_init(release_monitor, temp_db_module):
     """Test release monitor initialization"""
-    monitor = ReleaseMonitor(temp_db)
-    
-    assert monitor.db == temp_db
+    assert release_monitor.db == temp_db_module
 
 
-@pytest.mark.asyncio
-async def test_release_monitor_check_no_new_release(temp_db):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_release_monitor_check_no_new_release(release_monitor, release_pypi):
     """Test release monitor with no new release"""
-    monitor = ReleaseMonitor(temp_db)
+    mock_pypi = Mock()
+    mock_package_info = Mock()
+    mock_package_info.identifier.version = "2.31.0"
+    mock_package_info.latest_release = datetime.now(timezone.utc) - timedelta(days=2)
+    mock_pypi.get_package_info.return_value = mock_package_info
+    release_pypi.return_value.__enter__.return_value = mock_pypi
+    release_pypi.return_value.__exit__.return_value = None
+    
+    alerts = await release_monitor.check("requests")
     
-    with patch('provchain.watchdog.monitors.release.PyPIClient') as mock_pypi_class:
-        mock_pypi = Mock()
-        mock_package_info = Mock()
-        mock_package_info.identifier.version = "2.31.0"
-        mock_package_info.latest_release = datetime.now(timezone.utc) - timedelta(days=2)
-        mock_pypi.get_package_info.return_value = mock_package_info
-        mock_pypi_class.return_value.__enter__.return_value = mock_pypi
-        mock_pypi_class.return_value.__exit__.return_value = None
-        
-        alerts = await monitor.check("requests")
-        
-        assert len(alerts) == 0
-
-
-@pytest.mark.asyncio
-async def test_release_monitor_check_new_release(temp_db):
+    assert len(alerts) == 0
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_release_monitor_check_new_release(release_monitor, release_pypi):
     """Test release monitor with new release"""
-    monitor = ReleaseMonitor(temp_db)
+    mock_pypi = Mock()
+    mock_package_info = Mock()
+    mock_package_info.identifier.version = "2.32.0"
+    # Very recent release (within last hour)
+    mock_package_info.latest_release = datetime.now(timezone.utc) - timedelta(minutes=30)
+    mock_pypi.get_package_info.return_value = mock_package_info
+    release_pypi.return_value.__enter__.return_value = mock_pypi
+    release_pypi.return_value.__exit__.return_value = None
     
-    with patch('provchain.watchdog.monitors.release.PyPIClient') as mock_pypi_class:
-        mock_pypi = Mock()
-        mock_package_info = Mock()
-        mock_package_info.identifier.version = "2.32.0"
-        # Very recent release (within last hour)
-        mock_package_info.latest_release = datetime.now(timezone.utc) - timedelta(minutes=30)
-        mock_pypi.get_package_info.return_value = mock_package_info
-        mock_pypi_class.return_value.__enter__.return_value = mock_pypi
-        mock_pypi_class.return_value.__exit__.return_value = None
-        
-        alerts = await monitor.check("requests")
-        
-        assert len(alerts) > 0
-        assert alerts[0].alert_type == "new_release"
-        assert "2.32.0" in alerts[0].title
-
-
-@pytest.mark.asyncio
-async def test_release_monitor_check_error_handling(temp_db):
-    """Test release monitor error handling"""
-    monitor = ReleaseMonitor(temp_db)
+    alerts = await release_monitor.check("requests")
     
-    with patch('provchain.watchdog.monitors.release.PyPIClient') as mock_pypi_class:
-        mock_pypi_class.side_effect = Exception("API Error")
-        
-        alerts = await monitor.check("requests")
-        
-        # Should return empty list on error
-        assert len(alerts) == 0
+    assert len(alerts) > 0
+    assert alerts[0].alert_type == "new_release"
+    assert "2.32.0" in alerts[0].title
 
 
 # CVE Monitor Tests
-def test_cve_monitor_init(temp_db):
+def test_cve_monitor_init(cve_monitor, temp_db_module):
     """Test CVE monitor initialization"""
-    monitor = CVEMonitor(temp_db)
-    
-    assert monitor.db == temp_db
-    assert monitor.CHECK_INTERVAL == timedelta(minutes=15)
+    assert cve_monitor.db == temp_db_module
+    assert cve_monitor.CHECK_INTERVAL == timedelta(minutes=15)
 
 
-@pytest.mark.asyncio
-async def test_cve_monitor_check_no_vulnerabilities(temp_db):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_cve_monitor_check_no_vulnerabilities(cve_monitor, cve_http):
     """Test CVE monitor with no vulnerabilities"""
-    monitor = CVEMonitor(temp_db)
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"vulns": []}
+    mock_client.post.return_value = mock_response
+    cve_http.return_value.__enter__.return_value = mock_client
     
-    sbom = SBOM(
-        name="test-project",
-        packages=[
-            PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0")
-        ]
-    )
+    alerts = await cve_monitor.check(_REQUESTS_SBOM)
     
-    with patch('provchain.watchdog.monitors.cve.HTTPClient') as mock_client_class:
-        mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"vulns": []}
-        mock_client.post.return_value = mock_response
-        mock_client_class.return_value.__enter__.return_value = mock_client
-        
-        alerts = await monitor.check(sbom)
-        
-        assert len(alerts) == 0
-
-
-@pytest.mark.asyncio
-async def test_cve_monitor_check_with_vulnerabilities(temp_db):
+    assert len(alerts) == 0
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_cve_monitor_check_with_vulnerabilities(cve_monitor, cve_http):
     """Test CVE monitor with vulnerabilities found"""
-    monitor = CVEMonitor(temp_db)
-    
-    sbom = SBOM(
-        name="test-project",
-        packages=[
-            PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0")
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "vulns": [
+            {
+                "id": "CVE-2023-12345",
+                "summary": "Test vulnerability",
+                "database_specific": {"severity": "HIGH"},
+                "details": "Vulnerability details"
+            }
         ]
-    )
+    }
+    mock_client.post.return_value = mock_response
+    cve_http.return_value.__enter__.return_value = mock_client
     
-    with patch('provchain.watchdog.monitors.cve.HTTPClient') as mock_client_class:
-        mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "vulns": [
-                {
-                    "id": "CVE-2023-12345",
-                    "summary": "Test vulnerability",
-                    "database_specific": {"severity": "HIGH"},
-                    "details": "Vulnerability details"
-                }
-            ]
-        }
-        mock_client.post.return_value = mock_response
-        mock_client_class.return_value.__enter__.return_value = mock_client
-        
-        alerts = await monitor.check(sbom)
-        
-        assert len(alerts) > 0
-        assert alerts[0].alert_type == "cve"
-        assert "CVE-2023-12345" in alerts[0].title
-        assert alerts[0].severity == RiskLevel.HIGH
-
-
-@pytest.mark.asyncio
-async def test_cve_monitor_check_error_handling(temp_db):
-    """Test CVE monitor error handling"""
-    monitor = CVEMonitor(temp_db)
-    
-    sbom = SBOM(
-        name="test-project",
-        packages=[
-            PackageIdentifier(ecosystem="pypi", name="requests", version="2.31.0")
-        ]
-    )
+    alerts = await cve_monitor.check(_REQUESTS_SBOM)
     
-    with patch('provchain.watchdog.monitors.cve.HTTPClient') as mock_client_class:
-        mock_client_class.side_effect = Exception("API Error")
-        
-        alerts = await monitor.check(sbom)
-        
-        # Should return empty list on error
-        assert len(alerts) == 0
+    assert len(alerts) > 0
+    assert alerts[0].alert_type == "cve"
+    assert "CVE-2023-12345" in alerts[0].title
+    assert alerts[0].severity == RiskLevel.HIGH
 
 
-@pytest.mark.asyncio
-async def test_cve_monitor_check_non_pypi_package(temp_db):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_cve_monitor_check_non_pypi_package(cve_monitor, cve_http):
     """Test CVE monitor skips non-PyPI packages"""
-    monitor = CVEMonitor(temp_db)
-    
     sbom = SBOM(
         name="test-project",
         packages=[
@@ -177,45 +167,45 @@ async def test_cve_monitor_check_non_pypi_package(temp_db):
         ]
     )
     
-    alerts = await monitor.check(sbom)
+    alerts = await cve_monitor.check(sbom)
     
-    # Should return empty list for non-PyPI packages
+    # Should return empty list for non-PyPI packages, without querying OSV
     assert len(alerts) == 0
+    cve_http.assert_not_called()
 
 
 # Maintainer Monitor Tests
-def test_maintainer_monitor_init(temp_db):
+def test_maintainer_monitor_init(temp_db_module):
     """Test maintainer monitor initialization"""
-    monitor = MaintainerMonitor(temp_db, github_token="test_token")
+    monitor = MaintainerMonitor(temp_db_module, github_token="test_token")
     
-    assert monitor.db == temp_db
+    assert monitor.db == temp_db_module
     assert monitor.github_token == "test_token"
 
 
-@pytest.mark.asyncio
-async def test_maintainer_monitor_check_no_previous_snapshot(temp_db):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_maintainer_monitor_check_no_previous_snapshot(temp_db, maintainer_pypi):
     """Test maintainer monitor with no previous snapshot"""
     monitor = MaintainerMonitor(temp_db)
     
-    with patch('provchain.watchdog.monitors.maintainer.PyPIClient') as mock_pypi_class:
-        mock_pypi = MagicMock()
-        mock_package_info = MagicMock()
-        mock_maintainer = MagicMock()
-        mock_maintainer.username = "testuser"
-        mock_maintainer.email = "test@example.com"
-        mock_maintainer.profile_url = "https://example.com/testuser"
-        mock_package_info.maintainers = [mock_maintainer]
-        mock_pypi.get_package_info.return_value = mock_package_info
-        mock_pypi_class.return_value.__enter__.return_value = mock_pypi
-        
-        alerts = await monitor.check("requests")
-        
-        # Should store snapshot but not create alerts
-        assert len(alerts) == 0
-
-
-@pytest.mark.asyncio
-async def test_maintainer_monitor_check_new_maintainer(temp_db):
+    mock_pypi = MagicMock()
+    mock_package_info = MagicMock()
+    mock_maintainer = MagicMock()
+    mock_maintainer.username = "testuser"
+    mock_maintainer.email = "test@example.com"
+    mock_maintainer.profile_url = "https://example.com/testuser"
+    mock_package_info.maintainers = [mock_maintainer]
+    mock_pypi.get_package_info.return_value = mock_package_info
+    maintainer_pypi.return_value.__enter__.return_value = mock_pypi
+    
+    alerts = await monitor.check("requests")
+    
+    # Should store snapshot but not create alerts
+    assert len(alerts) == 0
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_maintainer_monitor_check_new_maintainer(temp_db, maintainer_pypi):
     """Test maintainer monitor detects new maintainer"""
     monitor = MaintainerMonitor(temp_db)
     
@@ -224,26 +214,25 @@ async def test_maintainer_monitor_check_new_maintainer(temp_db):
         {"username": "olduser", "email": "old@example.com", "profile_url": "https://example.com/olduser"}
     ])
     
-    with patch('provchain.watchdog.monitors.maintainer.PyPIClient') as mock_pypi_class:
-        mock_pypi = MagicMock()
-        mock_package_info = MagicMock()
-        mock_maintainer = MagicMock()
-        mock_maintainer.username = "newuser"
-        mock_maintainer.email = "new@example.com"
-        mock_maintainer.profile_url = "https://example.com/newuser"
-        mock_package_info.maintainers = [mock_maintainer]
-        mock_pypi.get_package_info.return_value = mock_package_info
-        mock_pypi_class.return_value.__enter__.return_value = mock_pypi
-        
-        alerts = await monitor.check("requests")
-        
-        assert len(alerts) > 0
-        assert alerts[0].alert_type == "maintainer_added"
-        assert alerts[0].severity == RiskLevel.HIGH
-
-
-@pytest.mark.asyncio
-async def test_maintainer_monitor_check_removed_maintainer(temp_db):
+    mock_pypi = MagicMock()
+    mock_package_info = MagicMock()
+    mock_maintainer = MagicMock()
+    mock_maintainer.username = "newuser"
+    mock_maintainer.email = "new@example.com"
+    mock_maintainer.profile_url = "https://example.com/newuser"
+    mock_package_info.maintainers = [mock_maintainer]
+    mock_pypi.get_package_info.return_value = mock_package_info
+    maintainer_pypi.return_value.__enter__.return_value = mock_pypi
+    
+    alerts = await monitor.check("requests")
+    
+    assert len(alerts) > 0
+    assert alerts[0].alert_type == "maintainer_added"
+    assert alerts[0].severity == RiskLevel.HIGH
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_maintainer_monitor_check_removed_maintainer(temp_db, maintainer_pypi):
     """Test maintainer monitor detects removed maintainer"""
     monitor = MaintainerMonitor(temp_db)
     
@@ -253,95 +242,77 @@ async def test_maintainer_monitor_check_removed_maintainer(temp_db):
         {"username": "user2", "email": "user2@example.com", "profile_url": "https://example.com/user2"}
     ])
     
-    with patch('provchain.watchdog.monitors.maintainer.PyPIClient') as mock_pypi_class:
-        mock_pypi = MagicMock()
-        mock_package_info = MagicMock()
-        mock_maintainer = MagicMock()
-        mock_maintainer.username = "user1"
-        mock_maintainer.email = "user1@example.com"
-        mock_maintainer.profile_url = "https://example.com/user1"
-        mock_package_info.maintainers = [mock_maintainer]  # Only user1 remains
-        mock_pypi.get_package_info.return_value = mock_package_info
-        mock_pypi_class.return_value.__enter__.return_value = mock_pypi
-        
-        alerts = await monitor.check("requests")
-        
-        assert len(alerts) > 0
-        assert alerts[0].alert_type == "maintainer_removed"
-        assert alerts[0].severity == RiskLevel.MEDIUM
-
-
-@pytest.mark.asyncio
-async def test_maintainer_monitor_check_error_handling(temp_db):
-    """Test maintainer monitor error handling"""
-    monitor = MaintainerMonitor(temp_db)
+    mock_pypi = MagicMock()
+    mock_package_info = MagicMock()
+    mock_maintainer = MagicMock()
+    mock_maintainer.username = "user1"
+    mock_maintainer.email = "user1@example.com"
+    mock_maintainer.profile_url = "https://example.com/user1"
+    mock_package_info.maintainers = [mock_maintainer]  # Only user1 remains
+    mock_pypi.get_package_info.return_value = mock_package_info
+    maintainer_pypi.return_value.__enter__.return_value = mock_pypi
+    
+    alerts = await monitor.check("requests")
     
-    with patch('provchain.watchdog.monitors.maintainer.PyPIClient') as mock_pypi_class:
-        mock_pypi_class.side_effect = Exception("API Error")
-        
-        alerts = await monitor.check("requests")
-        
-        # Should return empty list on error
-        assert len(alerts) == 0
+    assert len(alerts) > 0
+    assert alerts[0].alert_type == "maintainer_removed"
+    assert alerts[0].severity == RiskLevel.MEDIUM
 
 
 # Repository Monitor Tests
-def test_repo_monitor_init(temp_db):
+def test_repo_monitor_init(temp_db_module):
     """Test repository monitor initialization"""
-    monitor = RepositoryMonitor(temp_db, github_token="test_token")
+    monitor = RepositoryMonitor(temp_db_module, github_token="test_token")
     
-    assert monitor.db == temp_db
+    assert monitor.db == temp_db_module
     assert monitor.github_token == "test_token"
 
 
-@pytest.mark.asyncio
-async def test_repo_monitor_check_public_repo(temp_db):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_repo_monitor_check_public_repo(repo_monitor, repo_github):
     """Test repository monitor with public repository"""
-    monitor = RepositoryMonitor(temp_db)
+    mock_github = MagicMock()
+    mock_github.parse_repo_url.return_value = ("owner", "repo")
+    mock_github.get_repository.return_value = {"private": False}
+    mock_github.close = MagicMock()
+    repo_github.return_value = mock_github
     
-    with patch('provchain.watchdog.monitors.repo.GitHubClient') as mock_github_class:
-        mock_github = MagicMock()
-        mock_github.parse_repo_url.return_value = ("owner", "repo")
-        mock_github.get_repository.return_value = {"private": False}
-        mock_github.close = MagicMock()
-        mock_github_class.return_value = mock_github
-        
-        alerts = await monitor.check("https://github.com/owner/repo")
-        
-        assert len(alerts) == 0
-        mock_github.close.assert_called_once()
-
-
-@pytest.mark.asyncio
-async def test_repo_monitor_check_private_repo(temp_db):
+    alerts = await repo_monitor.check("https://github.com/owner/repo")
+    
+    assert len(alerts) == 0
+    mock_github.close.assert_called_once()
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_repo_monitor_check_private_repo(repo_monitor, repo_github):
     """Test repository monitor detects private repository"""
-    monitor = RepositoryMonitor(temp_db)
+    mock_github = MagicMock()
+    mock_github.parse_repo_url.return_value = ("owner", "repo")
+    mock_github.get_repository.return_value = {"private": True}
+    mock_github.close = MagicMock()
+    repo_github.return_value = mock_github
     
-    with patch('provchain.watchdog.monitors.repo.GitHubClient') as mock_github_class:
-        mock_github = MagicMock()
-        mock_github.parse_repo_url.return_value = ("owner", "repo")
-        mock_github.get_repository.return_value = {"private": True}
-        mock_github.close = MagicMock()
-        mock_github_class.return_value = mock_github
-        
-        alerts = await monitor.check("https://github.com/owner/repo")
-        
-        assert len(alerts) > 0
-        assert alerts[0].alert_type == "repo_visibility_change"
-        assert alerts[0].severity == RiskLevel.MEDIUM
-        mock_github.close.assert_called_once()
-
-
-@pytest.mark.asyncio
-async def test_repo_monitor_check_error_handling(temp_db):
-    """Test repository monitor error handling"""
-    monitor = RepositoryMonitor(temp_db)
+    alerts = await repo_monitor.check("https://github.com/owner/repo")
     
-    with patch('provchain.watchdog.monitors.repo.GitHubClient') as mock_github_class:
-        mock_github_class.side_effect = Exception("API Error")
-        
-        alerts = await monitor.check("https://github.com/owner/repo")
-        
-        # Should return empty list on error
-        assert len(alerts) == 0
-
+    assert len(alerts) > 0
+    assert alerts[0].alert_type == "repo_visibility_change"
+    assert alerts[0].severity == RiskLevel.MEDIUM
+    mock_github.close.assert_called_once()
+
+
+# Error handling, shared by all monitors
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize("monitor_cls, module, client, arg", [
+    pytest.param(ReleaseMonitor, release, "PyPIClient", "requests", id="release"),
+    pytest.param(CVEMonitor, cve, "HTTPClient", _REQUESTS_SBOM, id="cve"),
+    pytest.param(MaintainerMonitor, maintainer, "PyPIClient", "requests", id="maintainer"),
+    pytest.param(RepositoryMonitor, repo, "GitHubClient", "https://github.com/owner/repo", id="repo"),
+])
+async def test_monitor_check_error_handling(temp_db_module, monkeypatch, monitor_cls, module, client, arg):
+    """Test each monitor returns no alerts when its client fails"""
+    _patch_client(monkeypatch, module, client).side_effect = Exception("API Error")
+    
+    alerts = await monitor_cls(temp_db_module).check(arg)
+    
+    # Should return empty list on error
+    assert alerts == []